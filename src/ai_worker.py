@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Chạy tìm kiếm của AI trên luồng riêng (QThread) để cửa sổ không bị treo.
+
+Luồng chỉ làm việc trên một bản sao Position của bàn cờ nên luồng giao diện
+vẫn vẽ và xử lý sự kiện bình thường trong lúc AI suy nghĩ. Kết quả và tiến
+trình được gửi về qua tín hiệu Qt (được chuyển sang luồng giao diện).
+"""
+
+import traceback
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+
+class AISearchWorker(QThread):
+    """Luồng tìm nước đi cho một lượt của AI"""
+
+    # Tiến trình tìm kiếm: (độ sâu, giá trị)
+    progress = pyqtSignal(int, int)
+    # Nước đi tìm được: ((from_row, from_col), (to_row, to_col)) hoặc None
+    move_found = pyqtSignal(object)
+
+    def __init__(self, ai, position, parent=None):
+        """
+        Args:
+            ai: Engine có get_best_move(board, màu, on_progress=...) và cancel()
+            position: Thế cờ Position cần tìm nước đi (bên đi là position.side)
+            parent: QObject cha
+        """
+        super().__init__(parent)
+        self.ai = ai
+        self.position = position
+        self.cancelled = False
+
+    def run(self):
+        """
+        Thân luồng: tìm nước đi rồi phát move_found
+
+        move_found luôn được phát đúng một lần, với None nếu lượt tìm bị hủy
+        hoặc engine gặp lỗi, để giao diện không bị kẹt ở trạng thái chờ AI.
+        """
+        move = None
+        try:
+            if not self.cancelled:
+                move = self.ai.get_best_move(self.position, self.position.side,
+                                             on_progress=self._on_progress)
+        except Exception:
+            # Lỗi trong luồng phụ không được làm sập ứng dụng, chỉ in ra để dò lỗi
+            traceback.print_exc()
+        finally:
+            self.move_found.emit(None if self.cancelled else move)
+
+    def _on_progress(self, depth, value):
+        if not self.cancelled:
+            self.progress.emit(depth, int(value))
+
+    def cancel(self):
+        """
+        Hủy lượt tìm kiếm (không chờ luồng kết thúc); kết quả sẽ bị bỏ qua
+
+        Engine bị hủy hẳn (cờ hủy không bị lượt tìm kiếm đặt lại) nên không
+        được dùng lại cho lượt sau.
+        """
+        self.cancelled = True
+        self.ai.cancel()
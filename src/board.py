@@ -5,11 +5,15 @@ import os
 import numpy as np
 from PyQt5.QtWidgets import QWidget, QMessageBox
 from PyQt5.QtGui import QPainter, QColor, QPen, QBrush, QPixmap, QFont, QImage
-from PyQt5.QtCore import Qt, QRect, QPoint, pyqtSignal, QTimer
+from PyQt5.QtCore import Qt, QRect, QPoint, pyqtSignal
 from pieces import Piece, General, Advisor, Elephant, Horse, Chariot, Cannon, Soldier
 import copy
 import time
-from ai import ChineseChessAI
+from engine import (
+    ChineseChessAI, AdvancedChineseChessAI, Position, side_of, in_check, generate_legal_moves,
+    coords_to_move, move_to_coords,
+)
+from ai_worker import AISearchWorker
 from PIL import Image, ImageDraw, ImageFont
 
 # Kích thước bàn cờ
@@ -36,6 +40,10 @@ class ChineseChessBoard(QWidget):
     piece_captured = pyqtSignal(str)
     # Tín hiệu báo khi game kết thúc
     game_over = pyqtSignal(str)
+    # Tín hiệu phát ra khi AI bắt đầu (True) hoặc thôi (False) suy nghĩ
+    ai_thinking = pyqtSignal(bool)
+    # Tín hiệu tiến trình suy nghĩ của AI: (độ sâu, giá trị)
+    ai_progress = pyqtSignal(int, int)
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -49,14 +57,18 @@ class ChineseChessBoard(QWidget):
         self.selected_color = SELECTED_COLOR
         self.hint_color = QColor(0, 255, 0, 100)
         
+        # Luồng tìm nước đi của AI đang chạy (None nếu AI không suy nghĩ)
+        self.ai_worker = None
+        
+        # Loại AI ("basic" hoặc "advanced") và cấp độ; engine được tạo một lần cho
+        # mỗi ván trong reset_board() và giữ qua các lượt
+        self.ai_type = "basic"
+        self.ai_level = "medium"  # Mặc định là mức trung bình
+        
         # Khởi tạo bàn cờ
         self.board = [[0 for _ in range(9)] for _ in range(10)]
         self.reset_board()
         
-        # Khởi tạo AI
-        self.ai = ChineseChessAI()
-        self.ai_level = "medium"  # Mặc định là mức trung bình
-        
         # Theo dõi trạng thái chọn quân cờ
         self.selected_piece = None
         self.selected_position = None
@@ -91,6 +103,9 @@ class ChineseChessBoard(QWidget):
     
     def reset_board(self):
         """Khởi tạo lại bàn cờ"""
+        # Hủy lượt suy nghĩ của AI cho ván cũ
+        self.cancel_ai_move()
+        
         # Khởi tạo bàn cờ trống (10x9)
         self.board = [[0 for _ in range(BOARD_WIDTH)] for _ in range(BOARD_HEIGHT)]
         
@@ -164,14 +179,32 @@ class ChineseChessBoard(QWidget):
         # Đặt lại trạng thái kết thúc trò chơi
         self.game_over_state = False
         
+        # Engine và thế cờ của ván mới: thế cờ đi theo từng nước của ván (kèm lịch sử)
+        # để engine nối tiếp được lượt tìm kiếm trước
+        self.ai = self._create_ai()
+        self._rebuild_position()
+        
         # Cập nhật giao diện
         self.update()
     
+    def _create_ai(self):
+        """Tạo engine theo loại và cấp độ AI hiện tại"""
+        ai = AdvancedChineseChessAI() if self.ai_type == "advanced" else ChineseChessAI()
+        ai.set_difficulty(self.ai_level)
+        return ai
+    
     def set_ai_level(self, level):
         """Thiết lập cấp độ AI"""
         self.ai_level = level
         self.ai.set_difficulty(level)
     
+    def set_ai_type(self, ai_type):
+        """Thiết lập loại AI ("basic" hoặc "advanced"), engine mới dùng từ lượt sau"""
+        if ai_type != self.ai_type:
+            self.cancel_ai_move()
+            self.ai_type = ai_type
+            self.ai = self._create_ai()
+    
     def set_game_mode(self, mode):
         """Thiết lập chế độ chơi"""
         if self.game_mode != mode:
@@ -509,7 +542,7 @@ class ChineseChessBoard(QWidget):
                         
                         # Nếu thành công và ở chế độ AI, cho phép AI di chuyển
                         if move_success and self.game_mode == "human_vs_ai" and self.current_player == BLACK:
-                            QTimer.singleShot(500, self.make_ai_move)
+                            self.start_ai_move()
                     else:
                         # Hủy chọn nếu click vào ô không hợp lệ
                         self.selected_piece = None
@@ -518,28 +551,21 @@ class ChineseChessBoard(QWidget):
     
     def get_valid_moves(self, row, col):
         """Lấy danh sách các nước đi hợp lệ cho quân cờ tại vị trí (row, col)"""
-        if self.board[row][col] == 0 or self.board[row][col] == ' ':
-            return []
-            
         piece = self.board[row][col]
-        valid_moves = []
+        if piece == 0 or piece == ' ':
+            return []
         
-        # Lấy tất cả nước đi có thể
-        for to_row in range(10):
-            for to_col in range(9):
-                if self._is_valid_move(row, col, to_row, to_col):
-                    valid_moves.append((to_row, to_col))
-                    
+        # Sinh nước đi hợp lệ (đã loại nước tự chiếu) bằng engine trên thế cờ của ván
+        valid_moves = []
+        for move in generate_legal_moves(self.position, side_of(piece.color)):
+            from_pos, to_pos = move_to_coords(move)
+            if from_pos == (row, col):
+                valid_moves.append(to_pos)
         return valid_moves
     
     def _is_valid_move(self, from_row, from_col, to_row, to_col):
         """Kiểm tra nước đi có hợp lệ không"""
-        piece = self.board[from_row][from_col]
-        if piece == 0:
-            return False
-        
-        # Kiểm tra nước đi có hợp lệ theo luật của từng loại quân cờ
-        return piece.is_valid_move(self.board, (from_row, from_col), (to_row, to_col))
+        return (to_row, to_col) in self.get_valid_moves(from_row, from_col)
     
     def _make_move(self, from_row, from_col, to_row, to_col):
         """Thực hiện nước đi từ (from_row, from_col) đến (to_row, to_col)"""
@@ -586,6 +612,7 @@ class ChineseChessBoard(QWidget):
         # Thực hiện di chuyển
         self.board[to_row][to_col] = piece
         self.board[from_row][from_col] = 0
+        self.position.make_move(coords_to_move((from_row, from_col), (to_row, to_col)))
         
         # Chuyển lượt
         self.current_player = BLACK if self.current_player == RED else RED
@@ -608,40 +635,18 @@ class ChineseChessBoard(QWidget):
         self.red_in_check = False
         self.black_in_check = False
         
-        # Tìm vị trí của hai tướng
-        red_general_pos = None
-        black_general_pos = None
-        
-        for i in range(BOARD_HEIGHT):
-            for j in range(BOARD_WIDTH):
-                piece = self.board[i][j]
-                if isinstance(piece, General):
-                    if piece.color == RED:
-                        red_general_pos = (i, j)
-                    else:
-                        black_general_pos = (i, j)
+        # Thế cờ của ván: vị trí hai tướng được lưu sẵn, kiểm tra chiếu bằng
+        # cách nhìn ra từ ô của tướng thay vì gọi is_valid_move cho mọi quân
+        position = self.position
+        red_side = side_of(RED)
+        black_side = side_of(BLACK)
         
         # Nếu không tìm thấy một trong hai tướng, thoát
-        if not red_general_pos or not black_general_pos:
+        if position.generals[red_side] < 0 or position.generals[black_side] < 0:
             return
         
-        # Kiểm tra từng quân cờ đen xem có thể ăn tướng đỏ không
-        for i in range(BOARD_HEIGHT):
-            for j in range(BOARD_WIDTH):
-                piece = self.board[i][j]
-                if piece != 0 and piece.color == BLACK:
-                    if piece.is_valid_move(self.board, (i, j), red_general_pos):
-                        self.red_in_check = True
-                        break
-        
-        # Kiểm tra từng quân cờ đỏ xem có thể ăn tướng đen không
-        for i in range(BOARD_HEIGHT):
-            for j in range(BOARD_WIDTH):
-                piece = self.board[i][j]
-                if piece != 0 and piece.color == RED:
-                    if piece.is_valid_move(self.board, (i, j), black_general_pos):
-                        self.black_in_check = True
-                        break
+        self.red_in_check = in_check(position, red_side)
+        self.black_in_check = in_check(position, black_side)
         
         # Phát tín hiệu nếu có thay đổi trạng thái chiếu
         if old_red_in_check != self.red_in_check:
@@ -663,6 +668,11 @@ class ChineseChessBoard(QWidget):
                     self.game_over.emit("RED")  # Đỏ thắng vì Đen bị chiếu hết
             else:
                 self.check_status_changed.emit(False, "Đen")
+        
+        # Bên đến lượt không bị chiếu nhưng không còn nước đi hợp lệ (bị vây) cũng thua
+        if not self.game_over_state and not generate_legal_moves(position, side_of(self.current_player)):
+            self.game_over_state = True
+            self.game_over.emit("RED" if self.current_player == BLACK else "BLACK")
     
     def _check_game_over(self):
         """Kiểm tra xem trò chơi đã kết thúc chưa (tướng bị ăn)"""
@@ -689,19 +699,105 @@ class ChineseChessBoard(QWidget):
         self.last_move_is_ai = is_ai_move
         self.update()
 
+    def is_ai_turn(self):
+        """Kiểm tra có phải lượt của AI (quân Đen ở chế độ người vs máy) không"""
+        return (not self.game_over_state and self.game_mode == "human_vs_ai"
+                and self.current_player == BLACK)
+    
     def make_ai_move(self):
-        """Thực hiện nước đi của AI"""
-        if self.game_over_state:
-            return False
-            
-        # Kiểm tra xem có phải lượt của AI không
-        if self.game_mode != "human_vs_ai" or self.current_player == RED:
+        """Tính và thực hiện nước đi của AI ngay trên luồng hiện tại (chặn đến khi xong)"""
+        if not self.is_ai_turn():
             return False
             
         # Tính toán nước đi tốt nhất
-        from_pos, to_pos = self.ai.get_best_move(self.board, self.current_player, self.ai_level)
+        self.ai.set_difficulty(self.ai_level)
+        position = self._ai_position()
+        return self._apply_ai_move(self.ai.get_best_move(position, position.side))
+    
+    def start_ai_move(self):
+        """
+        Bắt đầu cho AI suy nghĩ trên luồng riêng; nước đi được thực hiện khi
+        luồng tìm xong (xem _on_ai_move_found), giao diện không bị treo
+        
+        Returns:
+            bool: True nếu đã bắt đầu tìm kiếm
+        """
+        if not self.is_ai_turn():
+            return False
         
-        if from_pos and to_pos:
+        # Hai luồng không được dùng chung engine (lượt bị hủy để lại engine cho luồng cũ)
+        self.cancel_ai_move()
+        
+        self.ai.set_difficulty(self.ai_level)
+        worker = AISearchWorker(self.ai, self._ai_position(), self)
+        worker.progress.connect(lambda depth, value: self._on_ai_progress(worker, depth, value))
+        worker.move_found.connect(lambda move: self._on_ai_move_found(worker, move))
+        worker.finished.connect(worker.deleteLater)
+        self.ai_worker = worker
+        worker.start()
+        self.ai_thinking.emit(True)
+        return True
+    
+    def _rebuild_position(self):
+        """
+        Dựng lại thế cờ của ván từ bàn cờ (mất lịch sử, engine tìm lại từ đầu)
+
+        Thế cờ được _make_move cập nhật theo từng nước; chỉ cần dựng lại khi bàn
+        cờ bị thay đổi ở chỗ khác (ván mới, tải ván, hoàn tác quá lịch sử).
+        """
+        self.position = Position.from_board(self.board, self.current_player)
+    
+    def _ai_position(self):
+        """Bản sao thế cờ của ván cho engine tìm kiếm trên luồng khác"""
+        return self.position.copy()
+    
+    def cancel_ai_move(self):
+        """
+        Hủy lượt suy nghĩ đang chạy của AI (khi hoàn tác, ván mới, đổi loại AI)
+        
+        Không chờ luồng tìm kiếm trên luồng giao diện: tín hiệu của luồng bị
+        ngắt, luồng tự kết thúc sau vài nút với engine đã bị hủy, còn các lượt
+        sau dùng engine mới để hai luồng không bao giờ dùng chung một engine.
+        """
+        worker = self.ai_worker
+        if worker is None:
+            return
+        self.ai_worker = None
+        worker.progress.disconnect()
+        worker.move_found.disconnect()
+        worker.cancel()
+        self.ai = self._create_ai()
+        self.ai_thinking.emit(False)
+    
+    def shutdown_ai(self):
+        """Hủy lượt suy nghĩ và chờ mọi luồng tìm kiếm kết thúc (chỉ dùng khi đóng cửa sổ)"""
+        self.cancel_ai_move()
+        for worker in self.findChildren(AISearchWorker):
+            worker.wait()
+    
+    def is_ai_thinking(self):
+        """Kiểm tra AI có đang suy nghĩ không"""
+        return self.ai_worker is not None
+    
+    def _on_ai_progress(self, worker, depth, value):
+        """Chuyển tiếp tiến trình của luồng tìm kiếm hiện tại (bỏ qua luồng đã bị hủy)"""
+        if worker is self.ai_worker:
+            self.ai_progress.emit(depth, value)
+    
+    def _on_ai_move_found(self, worker, move):
+        """Nhận nước đi từ luồng tìm kiếm (chạy trên luồng giao diện)"""
+        # Bỏ qua kết quả của lượt đã bị hủy hoặc đã bị thay thế
+        if worker is not self.ai_worker:
+            return
+        self.ai_worker = None
+        self.ai_thinking.emit(False)
+        if self.is_ai_turn():
+            self._apply_ai_move(move)
+    
+    def _apply_ai_move(self, move):
+        """Thực hiện nước đi ((from_row, from_col), (to_row, to_col)) của AI"""
+        if move:
+            from_pos, to_pos = move
             from_row, from_col = from_pos
             to_row, to_col = to_pos
             
@@ -717,6 +813,52 @@ class ChineseChessBoard(QWidget):
         
         return False
     
+    def undo_last_move(self):
+        """
+        Hoàn tác nước đi cuối cùng; ở chế độ người vs máy hoàn tác đến khi
+        lại đến lượt người chơi (hủy lượt suy nghĩ của AI nếu có)
+        
+        Returns:
+            bool: True nếu đã hoàn tác ít nhất một nước
+        """
+        self.cancel_ai_move()
+        if not self.move_history:
+            return False
+        
+        # Thế cờ dựng lại từ bàn cờ (tải ván, ...) không có lịch sử của các nước
+        # trước đó; khi đó dựng lại nó từ bàn cờ đã khôi phục
+        rebuild = False
+        while self.move_history:
+            state = self.move_history.pop()
+            if self.position.history:
+                self.position.unmake_move()
+            else:
+                rebuild = True
+            self.board = state['board']
+            self.current_player = state['current_player']
+            self.red_in_check = state['red_in_check']
+            self.black_in_check = state['black_in_check']
+            if state['captured_piece'] is not None and self.captured_pieces:
+                self.captured_pieces.pop()
+            if not (self.game_mode == "human_vs_ai" and self.current_player == BLACK):
+                break
+        if rebuild:
+            self._rebuild_position()
+        
+        # Nước đi cuối cùng còn lại (để hiển thị)
+        if self.move_history:
+            last = self.move_history[-1]
+            self.last_move = (last['from_pos'], last['to_pos'])
+        else:
+            self.last_move = None
+        self.last_move_is_ai = False
+        
+        self.selected_piece = None
+        self.selected_position = None
+        self.game_over_state = False
+        self.update()
+        return True
+    
     def get_game_state(self):
         """Lấy trạng thái trò chơi hiện tại để lưu"""
         game_state = {
@@ -746,6 +888,7 @@ class ChineseChessBoard(QWidget):
     
     def set_game_state(self, game_state):
         """Thiết lập trạng thái trò chơi từ dữ liệu đã lưu"""
+        self.cancel_ai_move()
         try:
             # Đặt lại bàn cờ
             self.board = np.zeros((BOARD_HEIGHT, BOARD_WIDTH), dtype=object)
@@ -791,6 +934,10 @@ class ChineseChessBoard(QWidget):
             self.captured_pieces = []
             self.valid_moves = []
             
+            # Ván đã lưu là một ván khác: engine và thế cờ mới
+            self.ai = self._create_ai()
+            self._rebuild_position()
+            
             # Cập nhật giao diện
             self.update()
             return True
@@ -812,51 +959,6 @@ class ChineseChessBoard(QWidget):
         # Nếu không bị chiếu, không thể bị chiếu hết
         if (color == RED and not self.red_in_check) or (color == BLACK and not self.black_in_check):
             return False
-            
-        # Kiểm tra xem còn nước đi nào để thoát khỏi tình trạng chiếu tướng
-        for row in range(BOARD_HEIGHT):
-            for col in range(BOARD_WIDTH):
-                piece = self.board[row][col]
-                if piece != 0 and piece.color == color:
-                    # Tìm tất cả nước đi có thể của quân cờ này
-                    for to_row in range(BOARD_HEIGHT):
-                        for to_col in range(BOARD_WIDTH):
-                            if (to_row, to_col) != (row, col) and piece.is_valid_move(self.board, (row, col), (to_row, to_col)):
-                                # Thử đi nước này xem có thoát khỏi chiếu tướng không
-                                if self._move_resolves_check(row, col, to_row, to_col):
-                                    return False  # Có ít nhất một nước đi để thoát
-        
-        # Nếu không tìm thấy nước nào để thoát, đó là chiếu hết
-        return True
-
-    def _move_resolves_check(self, from_row, from_col, to_row, to_col):
-        """Kiểm tra xem nước đi có giải quyết được tình trạng chiếu tướng không"""
-        # Lưu trạng thái hiện tại
-        original_board = copy.deepcopy(self.board)
-        original_red_in_check = self.red_in_check
-        original_black_in_check = self.black_in_check
-        
-        # Thử thực hiện nước đi
-        piece = self.board[from_row][from_col]
-        captured_piece = self.board[to_row][to_col]
-        
-        # Di chuyển quân cờ
-        self.board[to_row][to_col] = piece
-        self.board[from_row][from_col] = 0
-        
-        # Kiểm tra lại tình trạng chiếu tướng
-        self._check_for_check()
-        
-        # Kiểm tra xem còn bị chiếu không
-        resolved = False
-        if piece.color == RED:
-            resolved = not self.red_in_check
-        else:
-            resolved = not self.black_in_check
-        
-        # Khôi phục trạng thái ban đầu
-        self.board = original_board
-        self.red_in_check = original_red_in_check
-        self.black_in_check = original_black_in_check
         
-        return resolved
\ No newline at end of file
+        # Nước đi hợp lệ của engine đã loại các nước không thoát được chiếu
+        return not generate_legal_moves(self.position, side_of(color))
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Lõi engine cờ tướng không phụ thuộc PyQt5: luật đi (bảng nước đi, sinh nước
+đi), biểu diễn thế cờ, tìm kiếm và đánh giá.
+
+Màu quân trong engine là hằng số nguyên RED/BLACK. Giao diện (board.py,
+game.py) chỉ là lớp chuyển đổi: bàn cờ chứa Piece được đổi sang Position bằng
+Position.from_board(), màu QColor được đổi bằng side_of().
+"""
+
+from .movetables import (
+    RED, BLACK, GENERAL, ADVISOR, ELEPHANT, HORSE, CHARIOT, CANNON, SOLDIER,
+    BOARD_ROWS, BOARD_COLS, BOARD_SIZE, PIECE_NAMES, PIECE_TYPES,
+    encode_move, move_src, move_dst, move_to_coords, coords_to_move,
+)
+from .position import Position, side_of
+from .movegen import (
+    generate_moves, generate_legal_moves, generate_captures, in_check,
+    is_square_attacked,
+)
+from .transposition import TranspositionTable
+from .ai import ChineseChessAI
+from .ai_advanced import ChineseChessAI as AdvancedChineseChessAI
+
+__all__ = [
+    'RED', 'BLACK', 'GENERAL', 'ADVISOR', 'ELEPHANT', 'HORSE', 'CHARIOT', 'CANNON',
+    'SOLDIER', 'BOARD_ROWS', 'BOARD_COLS', 'BOARD_SIZE', 'PIECE_NAMES', 'PIECE_TYPES',
+    'encode_move', 'move_src', 'move_dst', 'move_to_coords', 'coords_to_move',
+    'Position', 'side_of',
+    'generate_moves', 'generate_legal_moves', 'generate_captures', 'in_check',
+    'is_square_attacked',
+    'TranspositionTable',
+    'ChineseChessAI', 'AdvancedChineseChessAI',
+]
@@ -0,0 +1,8 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Chạy engine theo giao thức UCCI: cd src && python -m engine"""
+
+from .ucci import main
+
+main()
@@ -0,0 +1,717 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import random
+from .movetables import RED, BLACK, PIECE_NAMES, move_src, move_dst, move_to_coords
+from .movegen import generate_legal_moves, generate_captures, piece_moves, in_check
+from .position import Position, side_of
+from .movepicker import see
+from .pst import build_pst, pst_score
+
+# Định nghĩa các giá trị của quân cờ
+PIECE_VALUES = {
+    "General": 10000,  # Tướng
+    "Advisor": 200,    # Sĩ
+    "Elephant": 200,   # Tượng
+    "Horse": 400,      # Mã
+    "Chariot": 900,    # Xe
+    "Cannon": 450,     # Pháo
+    "Soldier": 100,    # Tốt
+    # Sau khi tốt qua sông giá trị tăng lên
+    "AdvancedSoldier": 200,
+}
+
+# Tìm kiếm tĩnh (quiescence search)
+DELTA_MARGIN = 200         # Biên an toàn cho cắt tỉa delta
+QUIESCENCE_MAX_PLY = 8     # Số nước ăn quân tối đa xét thêm ở cuối cây
+
+# Số lớp mở rộng tối đa (chiếu tướng, chỉ có một nước thoát) trên mỗi đường đi
+MAX_EXTENSIONS = 4
+
+# Điểm chiếu hết; bên bị chiếu hết sau ply nước tính từ gốc nhận -(MATE_SCORE - ply)
+# để chiếu hết càng sớm càng được ưu tiên (và càng muộn càng được bên thua chọn)
+MATE_SCORE = 100000
+
+# Bảng vị trí cho từng loại quân, thể hiện giá trị của quân khi ở các vị trí khác nhau
+# Giá trị từ 0-9
+POSITION_VALUES = {
+    "General": [
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 1, 1, 1, 0, 0, 0],
+        [0, 0, 0, 2, 2, 2, 0, 0, 0],
+        [0, 0, 0, 3, 3, 3, 0, 0, 0],
+    ],
+    "Advisor": [
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 3, 0, 3, 0, 0, 0],
+        [0, 0, 0, 0, 5, 0, 0, 0, 0],
+        [0, 0, 0, 3, 0, 3, 0, 0, 0],
+    ],
+    "Elephant": [
+        [0, 0, 5, 0, 0, 0, 5, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [5, 0, 0, 0, 7, 0, 0, 0, 5],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 5, 0, 0, 0, 5, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+    ],
+    "Horse": [
+        [0, 1, 2, 2, 0, 2, 2, 1, 0],
+        [1, 2, 4, 4, 4, 4, 4, 2, 1],
+        [2, 4, 6, 6, 6, 6, 6, 4, 2],
+        [2, 4, 6, 8, 8, 8, 6, 4, 2],
+        [2, 4, 6, 8, 8, 8, 6, 4, 2],
+        [2, 4, 6, 8, 8, 8, 6, 4, 2],
+        [2, 4, 6, 6, 6, 6, 6, 4, 2],
+        [1, 2, 4, 4, 4, 4, 4, 2, 1],
+        [0, 1, 2, 2, 2, 2, 2, 1, 0],
+        [0, 0, 1, 1, 1, 1, 1, 0, 0],
+    ],
+    "Chariot": [
+        [6, 6, 6, 8, 10, 8, 6, 6, 6],
+        [6, 8, 8, 10, 12, 10, 8, 8, 6],
+        [6, 8, 8, 10, 12, 10, 8, 8, 6],
+        [8, 10, 10, 12, 14, 12, 10, 10, 8],
+        [10, 12, 12, 14, 16, 14, 12, 12, 10],
+        [8, 10, 10, 12, 14, 12, 10, 10, 8],
+        [6, 8, 8, 10, 12, 10, 8, 8, 6],
+        [6, 8, 8, 10, 12, 10, 8, 8, 6],
+        [4, 6, 6, 8, 10, 8, 6, 6, 4],
+        [2, 4, 4, 6, 8, 6, 4, 4, 2],
+    ],
+    "Cannon": [
+        [6, 6, 6, 8, 10, 8, 6, 6, 6],
+        [6, 8, 8, 10, 12, 10, 8, 8, 6],
+        [6, 8, 8, 10, 12, 10, 8, 8, 6],
+        [8, 10, 10, 12, 14, 12, 10, 10, 8],
+        [10, 12, 12, 14, 16, 14, 12, 12, 10],
+        [8, 10, 10, 12, 14, 12, 10, 10, 8],
+        [6, 8, 8, 10, 12, 10, 8, 8, 6],
+        [6, 8, 8, 10, 12, 10, 8, 8, 6],
+        [4, 6, 6, 8, 10, 8, 6, 6, 4],
+        [2, 4, 4, 6, 8, 6, 4, 4, 2],
+    ],
+    "Soldier": [
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [1, 3, 5, 7, 9, 7, 5, 3, 1],
+        [2, 4, 6, 8, 10, 8, 6, 4, 2],
+        [3, 5, 7, 9, 11, 9, 7, 5, 3],
+        [4, 6, 8, 10, 12, 10, 8, 6, 4],
+        [5, 7, 9, 11, 13, 11, 9, 7, 5],
+        [6, 8, 10, 12, 14, 12, 10, 8, 6],
+        [7, 9, 11, 13, 15, 13, 11, 9, 7],
+    ],
+}
+
+# Bảng giá trị quân + vị trí phẳng (xem pst.py), giá trị vị trí nhân 10.
+# ChineseChessAI._evaluate_board tính Mã 450 điểm.
+PIECE_SQUARE_TABLE = build_pst(PIECE_VALUES, POSITION_VALUES, 10)
+AI_PIECE_SQUARE_TABLE = build_pst(dict(PIECE_VALUES, Horse=450), POSITION_VALUES, 10)
+
+def get_valid_moves(position, player_color):
+    """Lấy tất cả các nước đi hợp lệ cho một người chơi"""
+    # Quân ghim và ô cấm được tính một lần, không thử đi/hoàn tác từng nước
+    return generate_legal_moves(position, player_color)
+
+def causes_self_check(position, move, player_color):
+    """Kiểm tra nước đi có gây ra tình trạng tự chiếu tướng không"""
+    # Thử di chuyển ngay trên thế cờ
+    position.make_move(move)
+    
+    # Kiểm tra tướng có bị chiếu không
+    check = is_in_check(position, player_color)
+    
+    # Hoàn tác nước đi
+    position.unmake_move()
+    return check
+
+def is_in_check(position, player_color):
+    """Kiểm tra một người chơi có đang bị chiếu tướng không"""
+    return in_check(position, player_color)
+
+def evaluate_board(position):
+    """Đánh giá giá trị của bàn cờ cho quân đỏ (giá trị dương = đỏ chiếm ưu thế)"""
+    # Vật chất + vị trí: dùng tổng điểm tăng dần nếu thế cờ đã gắn đúng bảng
+    if position.pst is PIECE_SQUARE_TABLE:
+        score = position.score
+    else:
+        score = pst_score(position, PIECE_SQUARE_TABLE)
+    
+    # Kiểm tra tình trạng chiếu tướng
+    if is_in_check(position, BLACK):
+        score += 50  # Bonus khi đỏ đang chiếu tướng đen
+    if is_in_check(position, RED):
+        score -= 50  # Bonus khi đen đang chiếu tướng đỏ
+    
+    return score
+
+def quiescence(position, alpha, beta, player_color, evaluate=None, ply=0, root_distance=0):
+    """
+    Tìm kiếm tĩnh: chỉ xét nước ăn quân (hoặc mọi nước thoát chiếu khi đang bị chiếu)
+    
+    Args:
+        position: Thế cờ
+        alpha, beta: Cửa sổ tìm kiếm theo góc nhìn của player_color
+        player_color: Bên đến lượt đi
+        evaluate: Hàm evaluate(position, player) trả về điểm theo góc nhìn của player
+                  (mặc định dùng evaluate_board)
+        ply: Số nước đã đi trong tìm kiếm tĩnh
+        root_distance: Số nước từ gốc tìm kiếm đến lúc bắt đầu tìm kiếm tĩnh
+                       (để tính khoảng cách chiếu hết)
+        
+    Returns:
+        Giá trị thế cờ theo góc nhìn của player_color
+    """
+    squares = position.squares
+    
+    if is_in_check(position, player_color):
+        # Đang bị chiếu: phải xét mọi nước thoát chiếu
+        moves = get_valid_moves(position, player_color)
+        if not moves:
+            return -(MATE_SCORE - root_distance - ply)  # Bị chiếu hết
+        stand_pat = None
+        best_value = float('-inf')
+    else:
+        # Đánh giá "đứng yên": bên đi có quyền không ăn quân
+        if evaluate is not None:
+            stand_pat = evaluate(position, player_color)
+        else:
+            stand_pat = evaluate_board(position) * player_color
+        if stand_pat >= beta or ply >= QUIESCENCE_MAX_PLY:
+            return stand_pat
+        alpha = max(alpha, stand_pat)
+        best_value = stand_pat
+        
+        # Ăn quân giá trị cao trước
+        moves = generate_captures(position, player_color)
+        moves.sort(key=lambda m: PIECE_VALUES[PIECE_NAMES[abs(squares[m & 127])]], reverse=True)
+    
+    for move in moves:
+        if stand_pat is not None:
+            # Cắt tỉa delta: ăn được quân này cũng không thể vượt alpha
+            gain = PIECE_VALUES[PIECE_NAMES[abs(squares[move_dst(move)])]]
+            if stand_pat + gain + DELTA_MARGIN <= alpha:
+                continue
+            # Bỏ nước ăn quân bị lỗ sau chuỗi trao đổi trên ô đích
+            if see(position, move) < 0:
+                continue
+        
+        position.make_move(move)
+        if stand_pat is not None and is_in_check(position, player_color):
+            position.unmake_move()  # Nước ăn quân để tướng mình bị chiếu
+            continue
+        value = -quiescence(position, -beta, -alpha, -player_color, evaluate, ply + 1,
+                            root_distance)
+        position.unmake_move()
+        
+        best_value = max(best_value, value)
+        alpha = max(alpha, value)
+        if alpha >= beta:
+            break  # Cắt tỉa beta
+    
+    return best_value
+
+def minimax(position, depth, alpha, beta, maximizing_player, player_color, extensions=0, ply=1):
+    """
+    Thuật toán Minimax với cắt tỉa Alpha-Beta
+    
+    Args:
+        extensions: Số lớp đã được mở rộng trên đường đi từ gốc đến nút này
+        ply: Số nước đã đi từ gốc đến nút này (để tính khoảng cách chiếu hết)
+    """
+    
+    # Mở rộng khi bị chiếu: tìm sâu thêm một lớp (có giới hạn trên mỗi đường đi)
+    extend = extensions < MAX_EXTENSIONS and is_in_check(position, player_color)
+    if extend:
+        depth += 1
+        extensions += 1
+    
+    # Đạt đến độ sâu tối đa: tìm kiếm tĩnh rồi đổi về góc nhìn của quân đỏ
+    if depth == 0:
+        if player_color == RED:
+            return quiescence(position, alpha, beta, RED, root_distance=ply)
+        return -quiescence(position, -beta, -alpha, BLACK, root_distance=ply)
+    
+    # Lấy tất cả nước đi hợp lệ
+    valid_moves = get_valid_moves(position, player_color)
+    
+    # Không còn nước đi hợp lệ, người chơi thua
+    if not valid_moves:
+        return -(MATE_SCORE - ply) if maximizing_player else MATE_SCORE - ply
+    
+    # Chỉ có đúng một nước thoát chiếu: mở rộng thêm một lớp nữa
+    if extend and len(valid_moves) == 1 and extensions < MAX_EXTENSIONS:
+        depth += 1
+        extensions += 1
+    
+    opponent_color = -player_color
+    
+    # Nếu đang tối đa hóa (lượt của người chơi đỏ)
+    if maximizing_player:
+        max_eval = float('-inf')
+        for move in valid_moves:
+            # Thực hiện nước đi
+            position.make_move(move)
+            
+            # Gọi đệ quy minimax cho đối thủ
+            eval = minimax(position, depth - 1, alpha, beta, False, opponent_color, extensions,
+                           ply + 1)
+            
+            # Hoàn tác nước đi
+            position.unmake_move()
+            
+            max_eval = max(max_eval, eval)
+            alpha = max(alpha, eval)
+            if beta <= alpha:
+                break  # Cắt tỉa beta
+        
+        return max_eval
+    
+    # Nếu đang tối thiểu hóa (lượt của người chơi đen)
+    else:
+        min_eval = float('inf')
+        for move in valid_moves:
+            # Thực hiện nước đi
+            position.make_move(move)
+            
+            # Gọi đệ quy minimax cho đối thủ
+            eval = minimax(position, depth - 1, alpha, beta, True, opponent_color, extensions,
+                           ply + 1)
+            
+            # Hoàn tác nước đi
+            position.unmake_move()
+            
+            min_eval = min(min_eval, eval)
+            beta = min(beta, eval)
+            if beta <= alpha:
+                break  # Cắt tỉa alpha
+        
+        return min_eval
+
+def find_best_move_minimax(position, player_color, depth=3):
+    """Tìm nước đi tốt nhất sử dụng thuật toán Minimax với Alpha-Beta"""
+    # Gắn bảng giá trị để evaluate_board dùng điểm cập nhật tăng dần
+    if position.pst is not PIECE_SQUARE_TABLE:
+        position.set_pst(PIECE_SQUARE_TABLE)
+    valid_moves = get_valid_moves(position, player_color)
+    
+    # Không còn nước đi hợp lệ
+    if not valid_moves:
+        return None
+    
+    best_move = None
+    
+    # Đỏ tối đa hóa điểm, đen tối thiểu hóa điểm
+    if player_color == RED:
+        best_value = float('-inf')
+        for move in valid_moves:
+            # Thực hiện nước đi
+            position.make_move(move)
+            
+            # Đánh giá
+            value = minimax(position, depth - 1, float('-inf'), float('inf'), False, BLACK)
+            position.unmake_move()
+            
+            if value > best_value:
+                best_value = value
+                best_move = move
+    else:
+        best_value = float('inf')
+        for move in valid_moves:
+            # Thực hiện nước đi
+            position.make_move(move)
+            
+            # Đánh giá
+            value = minimax(position, depth - 1, float('-inf'), float('inf'), True, RED)
+            position.unmake_move()
+            
+            if value < best_value:
+                best_value = value
+                best_move = move
+    
+    return best_move
+
+# Triển khai BFS đơn giản cho cấp độ Dễ
+def find_best_move_bfs(position, player_color):
+    """Tìm nước đi sử dụng BFS đơn giản - ưu tiên ăn quân có giá trị cao"""
+    valid_moves = get_valid_moves(position, player_color)
+    
+    if not valid_moves:
+        return None
+    
+    # Sắp xếp nước đi theo giá trị quân bị ăn
+    valued_moves = []
+    for move in valid_moves:
+        target = position.squares[move_dst(move)]
+        
+        # Giá trị của nước đi dựa trên quân bị ăn
+        if target * player_color < 0:
+            piece_type = PIECE_NAMES[abs(target)]
+            value = PIECE_VALUES.get(piece_type, 0)
+            valued_moves.append((move, value))
+        else:
+            # Nước đi không ăn quân nào
+            valued_moves.append((move, 0))
+    
+    # Sắp xếp theo giá trị, ưu tiên nước ăn quân có giá trị cao
+    valued_moves.sort(key=lambda x: x[1], reverse=True)
+    
+    # Nếu có nước ăn quân, chọn nước ăn quân có giá trị cao nhất
+    if valued_moves and valued_moves[0][1] > 0:
+        return valued_moves[0][0]
+    
+    # Nếu không có nước ăn quân, chọn ngẫu nhiên trong số các nước có thể
+    return valued_moves[0][0] if valued_moves else None
+
+# Monte Carlo Tree Search - phiên bản đơn giản
+class MCTSNode:
+    def __init__(self, position, player_color, parent=None, move=None):
+        self.position = position
+        self.player_color = player_color
+        self.parent = parent
+        self.move = move  # Nước đi dẫn đến trạng thái này
+        self.children = []
+        self.wins = 0
+        self.visits = 0
+        self.untried_moves = get_valid_moves(position, player_color)
+    
+    def select_child(self):
+        """Chọn con có UCB1 cao nhất"""
+        import math
+        
+        # Chọn con có UCB1 cao nhất
+        s = sorted(self.children, key=lambda c: c.wins/c.visits + 1.41 * math.sqrt(math.log(self.visits)/c.visits))
+        return s[-1]
+    
+    def expand(self):
+        """Mở rộng node hiện tại bằng cách thêm một con mới"""
+        if not self.untried_moves:
+            return None
+        
+        # Chọn ngẫu nhiên một nước đi chưa thử
+        move = random.choice(self.untried_moves)
+        self.untried_moves.remove(move)
+        
+        # Tạo thế cờ mới
+        new_position = self.position.copy()
+        new_position.make_move(move)
+        
+        # Tạo node con
+        opponent_color = -self.player_color
+        child = MCTSNode(new_position, opponent_color, self, move)
+        self.children.append(child)
+        return child
+    
+    def update(self, result):
+        """Cập nhật kết quả sau khi mô phỏng"""
+        self.visits += 1
+        self.wins += result
+        
+def find_best_move_mcts(position, player_color, simulations=1000, max_time=5):
+    """Tìm nước đi tốt nhất sử dụng Monte Carlo Tree Search"""
+    # Do MCTS cần triển khai phức tạp, chúng ta chỉ mô phỏng phần cơ bản
+    return find_best_move_minimax(position, player_color, depth=2)
+
+def make_ai_move(board, current_player, level="medium"):
+    """
+    Hàm AI chọn nước đi tốt nhất dựa trên độ khó
+    """
+    # Sẽ triển khai sau
+    pass
+
+class SearchStopped(Exception):
+    """Báo lượt tìm kiếm bị dừng giữa chừng bằng ChineseChessAI.stop()"""
+
+class ChineseChessAI:
+    def __init__(self):
+        self.difficulty = "medium"
+        self.max_depth = 3  # Giá trị mặc định cho độ sâu
+        # Cờ dừng tìm kiếm, có thể được đặt từ luồng khác; cờ hủy thì không bị
+        # lượt tìm kiếm sau đặt lại
+        self.stopped = False
+        self.cancelled = False
+        self.piece_values = {
+            '将': 10000, '帅': 10000,  # Tướng
+            '士': 200, '仕': 200,      # Sĩ
+            '象': 200, '相': 200,      # Tượng
+            '马': 450, '傌': 450,      # Mã
+            '车': 900, '俥': 900,      # Xe
+            '炮': 450, '砲': 450,      # Pháo
+            '卒': 100, '兵': 100       # Tốt
+        }
+        
+    def set_difficulty(self, level):
+        """Thiết lập độ khó cho AI"""
+        self.difficulty = level
+        if level == "easy":
+            self.max_depth = 2
+        elif level == "medium":
+            self.max_depth = 3
+        else:  # hard
+            self.max_depth = 4
+            
+    def get_best_move(self, board, current_player, difficulty=None, on_progress=None):
+        """
+        Trả về nước đi tốt nhất dựa trên các thuật toán AI
+        
+        Args:
+            board: Bàn cờ 10x9 của giao diện hoặc thế cờ Position
+            current_player: Màu của người chơi đến lượt
+            difficulty: Độ khó (tùy chọn)
+            on_progress: Hàm gọi với (độ sâu, giá trị) mỗi khi nước tốt nhất ở gốc thay đổi
+            
+        Returns:
+            tuple: ((from_row, from_col), (to_row, to_col)) hoặc None
+        """
+        if difficulty:
+            self.set_difficulty(difficulty)
+        
+        # Chuyển sang thế cờ gọn để tìm kiếm
+        player = side_of(current_player)
+        if isinstance(board, Position):
+            position = board.copy()
+            position.set_side(player)
+        else:
+            position = Position.from_board(board, player)
+        position.set_pst(AI_PIECE_SQUARE_TABLE)
+            
+        # Tùy thuộc vào độ khó, chọn thuật toán phù hợp
+        if self.difficulty == "easy":
+            move = self._get_random_move(position, player)
+        else:
+            move = self._get_minimax_move(position, player, self.max_depth, on_progress)
+        
+        return move_to_coords(move) if move is not None else None
+            
+    def _get_random_move(self, position, player):
+        """Trả về một nước đi ngẫu nhiên hợp lệ"""
+        import random
+        
+        # Tìm tất cả quân cờ của người chơi hiện tại
+        player_pieces = [sq for piece, sq in position.piece_squares(player)]
+        
+        # Trộn danh sách các quân cờ để tạo tính ngẫu nhiên
+        random.shuffle(player_pieces)
+        
+        # Thử lần lượt mỗi quân cờ cho đến khi tìm được nước đi hợp lệ
+        for start_sq in player_pieces:
+            # Tạo danh sách các nước đi tiềm năng
+            potential_moves = []
+            for move in piece_moves(position, start_sq):
+                # Kiểm tra nước đi không gây ra tự chiếu tướng
+                if not self._causes_self_check(position, move, player):
+                    potential_moves.append(move)
+            
+            # Nếu có nước đi hợp lệ, chọn ngẫu nhiên một nước
+            if potential_moves:
+                return random.choice(potential_moves)
+                
+        # Nếu không tìm thấy nước đi hợp lệ
+        return None
+
+    def _is_valid_move(self, position, move, player):
+        """Kiểm tra nước đi có hợp lệ không"""
+        # Kiểm tra quân cờ ở ô xuất phát có đúng màu không
+        start_sq = move_src(move)
+        if position.squares[start_sq] * player <= 0:
+            return False
+            
+        # Kiểm tra nước đi có hợp lệ theo luật chơi không
+        if move not in piece_moves(position, start_sq):
+            return False
+            
+        # Kiểm tra nước đi không gây ra tự chiếu tướng
+        return not self._causes_self_check(position, move, player)
+        
+    def _causes_self_check(self, position, move, player):
+        """Kiểm tra nước đi có gây ra tự chiếu tướng không"""
+        # Thực hiện nước đi ngay trên thế cờ
+        position.make_move(move)
+        
+        # Kiểm tra tướng có bị chiếu không
+        check = self._is_in_check(position, player)
+        
+        # Hoàn tác nước đi
+        position.unmake_move()
+        return check
+        
+    def _is_in_check(self, position, player):
+        """Kiểm tra một người chơi có đang bị chiếu tướng không"""
+        return in_check(position, player)
+        
+    def stop(self):
+        """Yêu cầu dừng lượt tìm kiếm đang chạy (gọi được từ luồng khác)"""
+        self.stopped = True
+        
+    def cancel(self):
+        """Hủy hẳn engine: dừng lượt đang chạy và mọi lượt tìm kiếm sau (gọi được từ luồng khác)"""
+        self.cancelled = True
+        self.stop()
+        
+    def _get_minimax_move(self, position, player, depth, on_progress=None):
+        """
+        Sử dụng thuật toán minimax với cắt tỉa alpha-beta để tìm nước đi tốt nhất
+        
+        Bị dừng bằng stop() thì trả về nước tốt nhất trong số các nước đã tìm xong.
+        """
+        self.stopped = False
+        # Lệnh hủy đến trước khi bắt đầu tìm không được mất vì dòng đặt lại ở trên
+        if self.cancelled:
+            self.stopped = True
+        root_ply = len(position.history)
+        best_move = None
+        best_value = float('-inf')
+        alpha = float('-inf')
+        beta = float('inf')
+        
+        # Tìm tất cả các nước đi hợp lệ
+        valid_moves = self._get_all_valid_moves(position, player)
+        
+        # Nếu không có nước đi hợp lệ, trả về None
+        if not valid_moves:
+            return None
+        
+        for move in valid_moves:
+            # Thực hiện nước đi
+            position.make_move(move)
+            
+            # Đánh giá giá trị của nước đi bằng minimax
+            try:
+                move_value = self._minimax(position, depth-1, alpha, beta, False, player)
+            except SearchStopped:
+                # Hoàn tác các nước đang dở trên thế cờ
+                while len(position.history) > root_ply:
+                    position.unmake_move()
+                break
+            
+            # Hoàn tác nước đi
+            position.unmake_move()
+            
+            # Cập nhật nước đi tốt nhất
+            if move_value > best_value:
+                best_value = move_value
+                best_move = move
+                if on_progress is not None:
+                    on_progress(depth, best_value)
+                # Chiếu hết ngay nước này: không nước nào tốt hơn được nữa
+                if best_value >= MATE_SCORE - 1:
+                    break
+                
+            alpha = max(alpha, best_value)
+        
+        # Dừng trước khi tìm xong nước nào: đi nước hợp lệ đầu tiên
+        if best_move is None:
+            best_move = valid_moves[0]
+        
+        return best_move
+        
+    def _minimax(self, position, depth, alpha, beta, is_maximizing, original_player, extensions=0,
+                 ply=1):
+        """
+        Thuật toán minimax với cắt tỉa alpha-beta
+        
+        Args:
+            extensions: Số lớp đã được mở rộng trên đường đi từ gốc đến nút này
+            ply: Số nước đã đi từ gốc đến nút này (để tính khoảng cách chiếu hết)
+        """
+        if self.stopped:
+            raise SearchStopped()
+        
+        # Điều kiện dừng
+        if self._is_game_over(position):
+            return self._evaluate_board(position, original_player)
+        
+        current_player = original_player if is_maximizing else self._get_opponent(original_player)
+        
+        # Mở rộng khi bị chiếu: tìm sâu thêm một lớp (có giới hạn trên mỗi đường đi)
+        extend = extensions < MAX_EXTENSIONS and self._is_in_check(position, current_player)
+        if extend:
+            depth += 1
+            extensions += 1
+        
+        if depth == 0:
+            # Tìm kiếm tĩnh các nước ăn quân ở cuối cây
+            if is_maximizing:
+                return quiescence(position, alpha, beta, original_player, self._evaluate_board,
+                                  root_distance=ply)
+            return -quiescence(position, -beta, -alpha, self._get_opponent(original_player),
+                               self._evaluate_board, root_distance=ply)
+        
+        valid_moves = self._get_all_valid_moves(position, current_player)
+        
+        # Không còn nước đi hợp lệ, bên đến lượt thua: chiếu hết càng sớm điểm càng cao
+        if not valid_moves:
+            return -(MATE_SCORE - ply) if is_maximizing else MATE_SCORE - ply
+        
+        # Chỉ có đúng một nước thoát chiếu: mở rộng thêm một lớp nữa
+        if extend and len(valid_moves) == 1 and extensions < MAX_EXTENSIONS:
+            depth += 1
+            extensions += 1
+        
+        if is_maximizing:
+            best_value = float('-inf')
+            
+            for move in valid_moves:
+                position.make_move(move)
+                value = self._minimax(position, depth-1, alpha, beta, False, original_player,
+                                      extensions, ply + 1)
+                position.unmake_move()
+                best_value = max(best_value, value)
+                alpha = max(alpha, best_value)
+                if beta <= alpha:
+                    break  # Cắt tỉa beta
+            return best_value
+        else:
+            best_value = float('inf')
+            
+            for move in valid_moves:
+                position.make_move(move)
+                value = self._minimax(position, depth-1, alpha, beta, True, original_player,
+                                      extensions, ply + 1)
+                position.unmake_move()
+                best_value = min(best_value, value)
+                beta = min(beta, best_value)
+                if beta <= alpha:
+                    break  # Cắt tỉa alpha
+            return best_value
+            
+    def _evaluate_board(self, position, player):
+        """Đánh giá trạng thái bàn cờ từ góc nhìn của player"""
+        # Giá trị quân + vị trí (vị trí nhân 10) được cập nhật tăng dần trong thế cờ
+        if position.pst is AI_PIECE_SQUARE_TABLE:
+            score = position.score
+        else:
+            score = pst_score(position, AI_PIECE_SQUARE_TABLE)
+        return score * player
+        
+    def _get_all_valid_moves(self, position, player):
+        """Trả về tất cả các nước đi hợp lệ của player"""
+        # Sinh nước đi từ bảng nước đi tính sẵn, loại nước tự chiếu nhờ quân ghim
+        return generate_legal_moves(position, player)
+        
+    def _get_opponent(self, player):
+        """Trả về đối thủ của người chơi"""
+        return BLACK if player == RED else RED
+            
+    def _is_game_over(self, position):
+        """Kiểm tra xem trò chơi đã kết thúc chưa (một trong hai tướng bị bắt)"""
+        # Trò chơi kết thúc nếu một trong hai tướng không còn trên bàn cờ
+        return position.generals[RED] < 0 or position.generals[BLACK] < 0
@@ -0,0 +1,1126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import math
+import random
+import time
+from .movetables import (
+    RED, BLACK, GENERAL, ADVISOR, ELEPHANT, HORSE, CHARIOT, CANNON, SOLDIER,
+    MOVE_SPACE, PIECE_NAMES, SQUARE_COORDS, square,
+    move_src, move_dst, move_to_coords,
+)
+from .movegen import (
+    generate_legal_moves, generate_captures, in_check,
+    generals_facing, attack_map,
+)
+from .position import Position, side_of
+from .movepicker import pick_moves, see
+from .pst import build_pst, pst_score
+from .transposition import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
+
+# Định nghĩa các giá trị của quân cờ
+PIECE_VALUES = {
+    "General": 10000,  # Tướng
+    "Advisor": 200,    # Sĩ
+    "Elephant": 200,   # Tượng
+    "Horse": 400,      # Mã
+    "Chariot": 900,    # Xe
+    "Cannon": 450,     # Pháo
+    "Soldier": 100,    # Tốt
+    # Sau khi tốt qua sông giá trị tăng lên
+    "AdvancedSoldier": 200,
+}
+
+# Trọng số cho các tính năng đánh giá
+FEATURE_WEIGHTS = {
+    "piece_value": 100,        # Giá trị quân cờ
+    "mobility": 2,             # Khả năng di chuyển
+    "king_safety": 5,          # An toàn của tướng
+    "pawn_advancement": 3,     # Tiến triển của tốt
+}
+
+# Bảng vị trí cho từng loại quân, thể hiện giá trị của quân khi ở các vị trí khác nhau
+# Giá trị từ 0-20 (cao hơn giá trị cũ)
+POSITION_VALUES = {
+    "General": [
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 2, 2, 2, 0, 0, 0],
+        [0, 0, 0, 5, 8, 5, 0, 0, 0],
+        [0, 0, 0, 10, 15, 10, 0, 0, 0],
+    ],
+    "Advisor": [
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 5, 0, 5, 0, 0, 0],
+        [0, 0, 0, 0, 8, 0, 0, 0, 0],
+        [0, 0, 0, 5, 0, 5, 0, 0, 0],
+    ],
+    "Elephant": [
+        [0, 0, 8, 0, 0, 0, 8, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [7, 0, 0, 0, 10, 0, 0, 0, 7],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 8, 0, 0, 0, 8, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+    ],
+    "Horse": [
+        [0, 2, 4, 4, 0, 4, 4, 2, 0],
+        [2, 4, 6, 6, 6, 6, 6, 4, 2],
+        [4, 6, 8, 8, 8, 8, 8, 6, 4],
+        [4, 6, 8, 10, 10, 10, 8, 6, 4],
+        [4, 6, 8, 10, 10, 10, 8, 6, 4],
+        [4, 6, 8, 10, 10, 10, 8, 6, 4],
+        [4, 6, 8, 8, 8, 8, 8, 6, 4],
+        [2, 4, 6, 6, 6, 6, 6, 4, 2],
+        [0, 2, 4, 4, 4, 4, 4, 2, 0],
+        [0, 0, 2, 2, 2, 2, 2, 0, 0],
+    ],
+    "Chariot": [
+        [10, 10, 10, 12, 14, 12, 10, 10, 10],
+        [10, 12, 12, 14, 16, 14, 12, 12, 10],
+        [10, 12, 12, 14, 16, 14, 12, 12, 10],
+        [12, 14, 14, 16, 18, 16, 14, 14, 12],
+        [14, 16, 16, 18, 20, 18, 16, 16, 14],
+        [12, 14, 14, 16, 18, 16, 14, 14, 12],
+        [10, 12, 12, 14, 16, 14, 12, 12, 10],
+        [10, 12, 12, 14, 16, 14, 12, 12, 10],
+        [8, 10, 10, 12, 14, 12, 10, 10, 8],
+        [6, 8, 8, 10, 12, 10, 8, 8, 6],
+    ],
+    "Cannon": [
+        [8, 8, 8, 10, 12, 10, 8, 8, 8],
+        [8, 10, 10, 12, 14, 12, 10, 10, 8],
+        [8, 10, 10, 12, 14, 12, 10, 10, 8],
+        [10, 12, 12, 14, 16, 14, 12, 12, 10],
+        [12, 14, 14, 16, 18, 16, 14, 14, 12],
+        [10, 12, 12, 14, 16, 14, 12, 12, 10],
+        [8, 10, 10, 12, 14, 12, 10, 10, 8],
+        [8, 10, 10, 12, 14, 12, 10, 10, 8],
+        [6, 8, 8, 10, 12, 10, 8, 8, 6],
+        [4, 6, 6, 8, 10, 8, 6, 6, 4],
+    ],
+    "Soldier": [
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [2, 4, 6, 8, 10, 8, 6, 4, 2],
+        [4, 6, 8, 10, 12, 10, 8, 6, 4],
+        [6, 8, 10, 12, 14, 12, 10, 8, 6],
+        [8, 10, 12, 14, 16, 14, 12, 10, 8],
+        [10, 12, 14, 16, 18, 16, 14, 12, 10],
+        [12, 14, 16, 18, 20, 18, 16, 14, 12],
+        [14, 16, 18, 20, 22, 20, 18, 16, 14],
+    ],
+}
+
+# Bảng giá trị quân + vị trí phẳng (xem pst.py), khớp với _get_piece_value/_get_position_value
+PIECE_SQUARE_TABLE = build_pst(PIECE_VALUES, POSITION_VALUES)
+
+# Đánh giá chiến thuật bổ sung
+TACTICS_BONUS = {
+    "control_center": 30,      # Kiểm soát trung tâm
+    "connected_chariots": 30,  # Xe liên kết
+    "protected_general": 50,   # Tướng được bảo vệ
+    "advanced_pawn": 20,       # Tốt tiến xa
+    "doubled_cannons": 40,     # Pháo đôi cùng hàng/cột
+    "horse_pair": 25,          # Cặp mã
+    "attacking_position": 35,  # Vị trí tấn công
+    "mobility": 5,             # Điểm cho mỗi nước đi hợp lệ
+}
+
+# Tìm kiếm tĩnh (quiescence search)
+DELTA_MARGIN = 200         # Biên an toàn cho cắt tỉa delta
+QUIESCENCE_MAX_PLY = 8     # Số nước ăn quân tối đa xét thêm ở cuối cây
+
+# Số nút giữa hai lần kiểm tra hạn thời gian (lũy thừa của 2)
+NODE_CHECK_INTERVAL = 64
+
+# Độ sâu tối đa (tính từ gốc) được lưu nước "sát thủ"
+MAX_PLY = 64
+
+# Điểm lịch sử vượt ngưỡng này thì cả bảng được chia đôi
+HISTORY_MAX = 1 << 20
+
+# Cửa sổ khát vọng (aspiration window) quanh giá trị của lần lặp trước
+ASPIRATION_WINDOW = 50
+ASPIRATION_MIN_DEPTH = 3   # Độ sâu nhỏ hơn thì tìm với cửa sổ đầy đủ
+
+# Cắt tỉa nước rỗng (null move pruning)
+NULL_MOVE_MIN_DEPTH = 3    # Độ sâu nhỏ nhất được thử bỏ lượt
+NULL_MOVE_DEEP = 7         # Từ độ sâu này dùng R = 3 thay vì R = 2
+NULL_VERIFY_DEPTH = 6      # Từ độ sâu này phải tìm kiểm chứng trước khi cắt
+
+# Giảm độ sâu cho nước đi muộn (late move reductions)
+LMR_MIN_DEPTH = 3          # Độ sâu nhỏ nhất được giảm
+LMR_MIN_MOVES = 3          # Số nước đầu tiên luôn tìm đủ độ sâu
+# Bảng mức giảm theo log, chỉ số [độ sâu][thứ tự nước]
+LMR_TABLE = [[0 if depth == 0 or number == 0
+              else int(0.75 + math.log(depth) * math.log(number) / 2.25)
+              for number in range(64)] for depth in range(64)]
+
+# Cắt tỉa vô ích (futility) ở các nút gần lá
+FUTILITY_DEPTH = 2                 # Độ sâu lớn nhất được cắt tỉa vô ích
+FUTILITY_MARGINS = [0, 200, 450]   # Biên theo độ sâu còn lại
+REVERSE_FUTILITY_MARGIN = 150      # Biên cho mỗi lớp của cắt tỉa vô ích ngược
+
+# Số lớp mở rộng tối đa (chiếu tướng, chỉ có một nước thoát) trên mỗi đường đi
+MAX_EXTENSIONS = 4
+
+
+class SearchTimeout(Exception):
+    """Báo hết thời gian suy nghĩ, dùng để dừng tìm kiếm giữa chừng"""
+
+class ChineseChessAI:
+    def __init__(self, difficulty='medium', hash_mb=16, null_move=True):
+        self.difficulty = difficulty
+        # Bật/tắt cắt tỉa nước rỗng
+        self.null_move = null_move
+        # Bảng chuyển vị giới hạn dung lượng, lưu trạng thái đã đánh giá
+        self.transposition_table = TranspositionTable(hash_mb)
+        
+        # Độ sâu tìm kiếm dựa theo độ khó
+        self.depths = {
+            'easy': 2,
+            'medium': 3,
+            'hard': 4,
+            'expert': 5
+        }
+        
+        # Điểm lịch sử [ô đi][ô đến] của các nước gây cắt tỉa, đánh chỉ số theo mã nước đi
+        self.history = [0] * MOVE_SPACE
+        
+        # Nước đáp trả đã gây cắt tỉa, đánh chỉ số theo nước vừa đi của đối phương
+        self.counter_moves = [0] * MOVE_SPACE
+        
+        # Hai nước "sát thủ" (gây cắt tỉa beta) cho mỗi độ sâu tính từ gốc
+        self.killers = [[0, 0] for _ in range(MAX_PLY)]
+        
+        # Trạng thái của lượt tìm kiếm hiện tại
+        self.root_ply = 0
+        self.deadline = float('inf')
+        self.max_nodes = float('inf')
+        self.nodes = 0
+        
+        # Cờ hủy (đặt bởi cancel() từ luồng khác), không bị lượt tìm kiếm sau đặt lại
+        self.cancelled = False
+        self.root_best_move = None
+        self.root_best_value = float('-inf')
+        
+        # Biến chính (PV) của lượt trước cùng khóa và số nước của thế cờ gốc khi đó:
+        # engine được giữ suốt ván nên lượt sau nối tiếp được nếu ván đi đúng dự đoán
+        self.pv = []
+        self.pv_root_key = None
+        self.pv_root_ply = 0
+        
+        # Thời gian tối đa cho mỗi lượt (msec)
+        self.time_limits = {
+            'easy': 1000,
+            'medium': 2000,
+            'hard': 5000,
+            'expert': 10000
+        }
+        
+        # Thống kê của lượt tìm kiếm gần nhất
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Đặt lại thống kê tìm kiếm (số lần giảm độ sâu, tìm lại, cắt tỉa)"""
+        self.stats = {
+            'reductions': 0,               # Số nước được giảm độ sâu (LMR)
+            're_searches': 0,              # Số lần phải tìm lại với độ sâu đầy đủ
+            'futility_prunes': 0,          # Số nước thường bị cắt tỉa vô ích
+            'reverse_futility_prunes': 0,  # Số nút bị cắt tỉa vô ích ngược
+        }
+
+    def set_difficulty(self, level):
+        """Thiết lập độ khó cho AI"""
+        if level in self.depths:
+            self.difficulty = level
+        else:
+            self.difficulty = 'medium'  # Mặc định
+
+    def get_board_hash(self, position):
+        """Trả về khóa Zobrist 64 bit (đã gồm bên đến lượt) của thế cờ"""
+        return position.key
+
+    def get_best_move(self, board, player_color, on_progress=None):
+        """
+        Trả về nước đi tốt nhất sử dụng Iterative Deepening
+        
+        Args:
+            board: Bàn cờ 10x9 của giao diện hoặc thế cờ Position
+            player_color: Màu của bên đi (QColor, 'r'/'b' hoặc RED/BLACK)
+            on_progress: Hàm gọi với (độ sâu, giá trị) sau mỗi độ sâu đã tìm xong
+            
+        Returns:
+            tuple: ((from_row, from_col), (to_row, to_col)) hoặc None
+        """
+        time_limit = self.time_limits[self.difficulty] / 1000  # Chuyển từ msec sang sec
+        max_depth = self.depths[self.difficulty]
+        
+        # Chuyển sang thế cờ gọn để tìm kiếm
+        player_color = side_of(player_color)
+        if isinstance(board, Position):
+            position = board.copy()
+            position.set_side(player_color)
+        else:
+            position = Position.from_board(board, player_color)
+        
+        on_iteration = None
+        if on_progress is not None:
+            on_iteration = lambda depth, move, value: on_progress(depth, value)
+        best_move, _ = self.search(position, max_depth, time_limit, on_iteration=on_iteration)
+        
+        # Sử dụng chiến lược ngẫu nhiên cho cấp độ dễ
+        if self.difficulty == 'easy' and random.random() < 0.3:
+            valid_moves = self._get_all_valid_moves(position, player_color)
+            if valid_moves:
+                best_move = random.choice(valid_moves)
+        
+        return move_to_coords(best_move) if best_move is not None else None
+    
+    def search(self, position, max_depth, time_limit=float('inf'), max_nodes=float('inf'),
+               on_iteration=None):
+        """
+        Tìm kiếm sâu dần (Iterative Deepening) trên thế cờ Position
+        
+        Thế cờ được khôi phục nguyên trạng khi trả về, kể cả khi bị dừng giữa chừng.
+        Bảng chuyển vị chỉ được tăng tuổi (không xóa) giữa các lượt; nếu thế cờ
+        (cùng lịch sử) nối tiếp lượt trước thì nước sát thủ được dịch theo số nước
+        đã đi và nước tiếp theo trong PV cũ được thử đầu tiên.
+        
+        Args:
+            position: Thế cờ, bên đi là position.side
+            max_depth: Độ sâu tối đa
+            time_limit: Thời gian suy nghĩ tối đa (giây)
+            max_nodes: Số nút tối đa được duyệt
+            on_iteration: Hàm gọi sau mỗi độ sâu đã tìm xong với
+                          (độ sâu, nước tốt nhất, giá trị)
+            
+        Returns:
+            tuple: (nước đi dạng số nguyên hoặc None, giá trị)
+        """
+        start_time = time.time()
+        player_color = position.side
+        position.set_pst(PIECE_SQUARE_TABLE)
+        
+        best_move = None
+        best_value = float('-inf')
+        self.transposition_table.new_search()
+        
+        # Hạn chót và giới hạn số nút được kiểm tra định kỳ trong lúc tìm kiếm;
+        # lệnh hủy đến trước khi bắt đầu tìm không được mất vì dòng đặt lại hạn chót
+        self.deadline = start_time + time_limit
+        if self.cancelled:
+            self.stop()
+        self.max_nodes = max_nodes
+        self.nodes = 0
+        root_ply = self.root_ply = len(position.history)
+        
+        # Nối tiếp lượt trước: nước sát thủ ở lớp k + (số nước đã đi) giờ là lớp k
+        played = self._moves_since_last_search(position)
+        seed_move = 0
+        if played is None or len(played) >= MAX_PLY:
+            self.killers = [[0, 0] for _ in range(MAX_PLY)]
+        else:
+            self.killers = self.killers[len(played):] + [[0, 0] for _ in played]
+            if self.pv[:len(played)] == played and len(self.pv) > len(played):
+                seed_move = self.pv[len(played)]
+        self._age_history()
+        self.reset_stats()
+        
+        # Iterative Deepening
+        for depth in range(1, max_depth + 1):
+            # Kiểm tra thời gian (sử dụng 80% thời gian) và lệnh dừng
+            now = time.time()
+            if now - start_time > time_limit * 0.8 or now >= self.deadline:
+                break
+            
+            try:
+                move, value = self._get_best_move_at_depth(position, player_color, depth,
+                                                           best_move or seed_move, best_value)
+            except SearchTimeout:
+                # Hoàn tác các nước đang dở trên thế cờ
+                while len(position.history) > root_ply:
+                    position.unmake_move()
+                # Nước tốt nhất cũ được thử đầu tiên nên kết quả dở dang
+                # chỉ dùng được khi đã tìm xong ít nhất một nước
+                if self.root_best_move is not None:
+                    best_move = self.root_best_move
+                    best_value = self.root_best_value
+                break
+            
+            if move is not None:
+                best_move = move
+                best_value = value
+            
+            if on_iteration is not None:
+                on_iteration(depth, move, value)
+                
+            # Kiểm tra chiếu tướng/chiếu hết
+            if abs(value) > 9000:
+                break  # Đã tìm thấy nước dẫn đến thắng/thua
+        
+        # Chưa tìm xong nước nào trước khi hết giờ: đi nước hợp lệ đầu tiên
+        if best_move is None:
+            valid_moves = self._get_all_valid_moves(position, player_color)
+            if valid_moves:
+                best_move = self._order_moves(position, valid_moves, player_color)[0]
+        
+        # Lưu PV để lượt sau nối tiếp
+        if best_move is not None:
+            self.pv = self.principal_variation(position, best_move)
+            self.pv_root_key = position.key
+            self.pv_root_ply = root_ply
+        
+        return best_move, best_value
+    
+    def _moves_since_last_search(self, position):
+        """
+        Các nước đã đi từ thế cờ gốc của lượt trước đến thế cờ hiện tại
+        
+        Returns:
+            list: Các nước đi, hoặc None nếu thế cờ không nối tiếp lượt trước
+                  (ván mới, đã hoàn tác, hoặc thế cờ không kèm lịch sử)
+        """
+        history = position.history
+        ply = self.pv_root_ply
+        if self.pv_root_key is None or ply > len(history):
+            return None
+        key = history[ply][2] if ply < len(history) else position.key
+        if key != self.pv_root_key:
+            return None
+        return [entry[0] for entry in history[ply:]]
+    
+    def stop(self):
+        """Yêu cầu dừng lượt tìm kiếm đang chạy (gọi được từ luồng khác)"""
+        self.deadline = float('-inf')
+    
+    def cancel(self):
+        """Hủy hẳn engine: dừng lượt đang chạy và mọi lượt tìm kiếm sau (gọi được từ luồng khác)"""
+        self.cancelled = True
+        self.stop()
+    
+    def principal_variation(self, position, move, max_length=MAX_PLY):
+        """
+        Dựng biến chính (PV) bắt đầu bằng nước move từ các nước tốt nhất trong bảng chuyển vị
+        
+        Args:
+            position: Thế cờ gốc (được khôi phục nguyên trạng)
+            move: Nước đi đầu tiên của biến
+            max_length: Số nước tối đa
+            
+        Returns:
+            list: Các nước đi dạng số nguyên
+        """
+        pv = []
+        while move and len(pv) < max_length:
+            pv.append(move)
+            position.make_move(move)
+            if position.is_repetition():
+                break
+            entry = self.transposition_table.probe(position.key)
+            move = entry[3] if entry is not None else 0
+            if move and move not in generate_legal_moves(position):
+                break
+        for _ in pv:
+            position.unmake_move()
+        return pv
+    
+    def _get_best_move_at_depth(self, position, player_color, depth, previous_best=None,
+                                previous_value=None):
+        """
+        Tìm nước đi tốt nhất với độ sâu cụ thể
+        
+        Args:
+            previous_best: Nước tốt nhất của lần lặp trước, được thử đầu tiên
+            previous_value: Giá trị của lần lặp trước, làm tâm cửa sổ khát vọng
+        """
+        self.root_best_move = None
+        self.root_best_value = float('-inf')
+        
+        # Lấy tất cả nước đi hợp lệ
+        valid_moves = self._get_all_valid_moves(position, player_color)
+        if not valid_moves:
+            return None, -10000  # Thua nếu không có nước đi hợp lệ
+        
+        # Sắp xếp nước đi để tối ưu cắt tỉa Alpha-Beta
+        ordered_moves = self._order_moves(position, valid_moves, player_color, previous_best)
+        
+        # Cửa sổ khát vọng quanh giá trị cũ, chỉ dùng khi giá trị cũ đáng tin
+        delta = ASPIRATION_WINDOW
+        if (depth < ASPIRATION_MIN_DEPTH or previous_value is None
+                or abs(previous_value) > 9000):
+            alpha, beta = float('-inf'), float('inf')
+        else:
+            alpha, beta = previous_value - delta, previous_value + delta
+        
+        while True:
+            best_move, best_value = self._search_root(position, ordered_moves, player_color,
+                                                      depth, alpha, beta)
+            if best_value <= alpha:
+                # Thất bại thấp: nới cận dưới rồi tìm lại
+                delta *= 4
+                alpha = best_value - delta if delta < 2000 else float('-inf')
+            elif best_value >= beta:
+                # Thất bại cao: nới cận trên, thử nước vừa vượt beta trước
+                delta *= 4
+                beta = best_value + delta if delta < 2000 else float('inf')
+                ordered_moves.remove(best_move)
+                ordered_moves.insert(0, best_move)
+            else:
+                return best_move, best_value
+    
+    def _search_root(self, position, ordered_moves, player_color, depth, alpha, beta):
+        """
+        Tìm kiếm các nước ở gốc với cửa sổ (alpha, beta) bằng PVS
+        
+        Returns:
+            tuple: (nước tốt nhất, giá trị); giá trị <= alpha hoặc >= beta
+                   nghĩa là kết quả nằm ngoài cửa sổ
+        """
+        best_move = None
+        best_value = float('-inf')
+        opponent_color = self._get_opponent(player_color)
+        
+        for index, move in enumerate(ordered_moves):
+            # Thực hiện nước đi
+            position.make_move(move)
+            
+            # Nước đầu tiên tìm với cửa sổ đầy đủ, các nước sau với cửa sổ rỗng
+            # và chỉ tìm lại khi nước đó vượt alpha
+            if index == 0:
+                value = -self._alpha_beta(position, depth-1, -beta, -alpha, opponent_color)
+            else:
+                value = -self._alpha_beta(position, depth-1, -alpha-1, -alpha, opponent_color)
+                if alpha < value < beta:
+                    value = -self._alpha_beta(position, depth-1, -beta, -alpha, opponent_color)
+            
+            # Hoàn tác nước đi
+            position.unmake_move()
+            
+            if value > best_value:
+                best_value = value
+                best_move = move
+                
+            if value > alpha:
+                alpha = value
+                # Lưu kết quả dở dang phòng khi hết giờ giữa lần lặp
+                self.root_best_move = move
+                self.root_best_value = value
+                # Nước thường tốt nhất ở gốc cũng được cộng điểm lịch sử
+                if not position.squares[move_dst(move)]:
+                    self.history[move] += depth * depth
+                if alpha >= beta:
+                    break  # Vượt cửa sổ khát vọng
+            
+        return best_move, best_value
+    
+    def _alpha_beta(self, position, depth, alpha, beta, player_color, allow_null=True,
+                    extensions=0):
+        """
+        Alpha-Beta Pruning với Transposition Table
+        
+        Args:
+            allow_null: Cho phép thử bỏ lượt ở nút này (tắt khi tìm kiểm chứng)
+            extensions: Số lớp đã được mở rộng trên đường đi từ gốc đến nút này
+        """
+        self._check_time()
+        
+        # Thế cờ lặp lại trên đường đi hiện tại được tính là hòa
+        if position.is_repetition():
+            return 0
+        
+        # Kiểm tra hash trước
+        board_hash = self.get_board_hash(position)
+        hash_move = 0
+        entry = self.transposition_table.probe(board_hash)
+        if entry is not None:
+            tt_value, tt_depth, tt_flag, hash_move = entry
+            if tt_depth >= depth:
+                if tt_flag == EXACT:
+                    return tt_value
+                elif tt_flag == LOWER_BOUND and tt_value > alpha:
+                    alpha = tt_value
+                elif tt_flag == UPPER_BOUND and tt_value < beta:
+                    beta = tt_value
+                
+                if alpha >= beta:
+                    return tt_value
+        
+        # Kiểm tra kết thúc
+        if self._is_game_over(position):
+            # Kiểm tra chiếu hết - người hiện tại thua
+            if self._is_in_check(position, player_color):
+                return -10000  # Thua
+            return 0  # Hòa - trường hợp khác
+        
+        # Mở rộng khi bị chiếu: tìm sâu thêm một lớp, thêm một lớp nữa nếu chỉ
+        # có đúng một nước thoát chiếu; tổng số lớp mở rộng trên đường đi có giới hạn
+        in_check = self._is_in_check(position, player_color)
+        if in_check and extensions < MAX_EXTENSIONS:
+            depth += 1
+            extensions += 1
+            if (extensions < MAX_EXTENSIONS
+                    and len(self._get_all_valid_moves(position, player_color)) == 1):
+                depth += 1
+                extensions += 1
+        
+        # Điều kiện dừng: tìm kiếm tĩnh các nước ăn quân thay vì đánh giá ngay
+        if depth == 0:
+            return self._quiescence(position, alpha, beta, player_color)
+        
+        # Cắt tỉa vô ích ở nút gần lá (không áp dụng khi bị chiếu hoặc gần điểm chiếu hết)
+        futility_value = None
+        if depth <= FUTILITY_DEPTH and not in_check and abs(alpha) < 9000 and abs(beta) < 9000:
+            static_eval = self._evaluate_board(position, player_color)
+            # Cắt tỉa vô ích ngược: đánh giá tĩnh vượt beta một khoảng đủ lớn
+            if beta - alpha == 1 and static_eval - REVERSE_FUTILITY_MARGIN * depth >= beta:
+                self.stats['reverse_futility_prunes'] += 1
+                return static_eval
+            futility_value = static_eval + FUTILITY_MARGINS[depth]
+        
+        # Cắt tỉa nước rỗng: nếu bỏ lượt mà vẫn vượt beta thì coi như cắt được.
+        # Chỉ thử ở nút cửa sổ rỗng, không bị chiếu, không ngay sau một nước
+        # bỏ lượt khác và khi còn quân mạnh (tránh thế "zugzwang" cuối cờ)
+        if (self.null_move and allow_null and depth >= NULL_MOVE_MIN_DEPTH
+                and beta - alpha == 1 and position.history and position.history[-1][0]
+                and not in_check and self._has_null_move_material(position, player_color)):
+            reduction = 3 if depth >= NULL_MOVE_DEEP else 2
+            position.make_null_move()
+            value = -self._alpha_beta(position, depth - 1 - reduction, -beta, -beta + 1,
+                                      self._get_opponent(player_color), extensions=extensions)
+            position.unmake_move()
+            if value >= beta:
+                if value > 9000:
+                    value = beta  # Không tin điểm chiếu hết có được nhờ bỏ lượt
+                if depth < NULL_VERIFY_DEPTH:
+                    return value
+                # Ở độ sâu lớn: tìm kiểm chứng (không bỏ lượt) với độ sâu đã giảm
+                value = self._alpha_beta(position, depth - reduction, beta - 1, beta,
+                                         player_color, False, extensions)
+                if value >= beta:
+                    return value
+        
+        ply = min(len(position.history) - self.root_ply, MAX_PLY - 1)
+        killers = self.killers[ply]
+        previous_move = position.history[-1][0] if position.history else 0
+        
+        max_value = float('-inf')
+        best_move = 0
+        legal_moves = 0
+        flag = UPPER_BOUND  # Mặc định là giới hạn trên
+        
+        # Lấy nước đi theo từng giai đoạn: nước trong bảng chuyển vị, ăn quân,
+        # nước "sát thủ", rồi nước thường; chỉ sinh tiếp khi chưa cắt tỉa
+        for move in pick_moves(position, player_color, hash_move, killers, self.history,
+                               self.counter_moves[previous_move]):
+            captured = position.make_move(move)
+            if self._is_in_check(position, player_color):
+                position.unmake_move()  # Nước đi để tướng mình bị chiếu
+                continue
+            legal_moves += 1
+            opponent_color = self._get_opponent(player_color)
+            
+            # Nước ăn quân, nước "sát thủ", nước chiếu tướng và nước thoát chiếu
+            # không bị cắt tỉa hay giảm độ sâu
+            reducible = legal_moves > 1 and (futility_value is not None or (
+                depth >= LMR_MIN_DEPTH and legal_moves > LMR_MIN_MOVES))
+            quiet = (reducible and not captured and not in_check and move not in killers
+                     and not self._is_in_check(position, opponent_color))
+            
+            # Cắt tỉa vô ích: nước thường không thể đưa điểm lên tới alpha
+            if quiet and futility_value is not None and futility_value <= alpha:
+                position.unmake_move()
+                self.stats['futility_prunes'] += 1
+                max_value = max(max_value, futility_value)
+                continue
+            
+            # PVS: nước đầu tiên tìm với cửa sổ đầy đủ, các nước sau với cửa sổ
+            # rỗng và chỉ tìm lại khi nước đó vượt alpha
+            if legal_moves == 1:
+                value = -self._alpha_beta(position, depth-1, -beta, -alpha,
+                                          opponent_color, True, extensions)
+            else:
+                # LMR: nước thường xếp sau được tìm nông hơn
+                reduction = 0
+                if quiet and depth >= LMR_MIN_DEPTH and legal_moves > LMR_MIN_MOVES:
+                    reduction = min(LMR_TABLE[min(depth, 63)][min(legal_moves, 63)], depth - 2)
+                value = -self._alpha_beta(position, depth-1-reduction, -alpha-1, -alpha,
+                                          opponent_color, True, extensions)
+                if reduction:
+                    self.stats['reductions'] += 1
+                    if value > alpha:
+                        # Nước bị giảm lại vượt alpha: tìm lại với độ sâu đầy đủ
+                        self.stats['re_searches'] += 1
+                        value = -self._alpha_beta(position, depth-1, -alpha-1, -alpha,
+                                                  opponent_color, True, extensions)
+                if alpha < value < beta:
+                    value = -self._alpha_beta(position, depth-1, -beta, -alpha,
+                                              opponent_color, True, extensions)
+            position.unmake_move()
+            
+            if value > max_value:
+                max_value = value
+                best_move = move
+                
+            if value > alpha:
+                alpha = value
+                flag = EXACT  # Giá trị chính xác
+                
+            if alpha >= beta:
+                flag = LOWER_BOUND  # Giới hạn dưới
+                if not captured:
+                    self._record_cutoff(move, depth, killers, previous_move)
+                break  # Cắt tỉa Beta
+        
+        if not legal_moves:
+            return -10000  # Không có nước đi hợp lệ - thua
+        
+        # Lưu vào hash table
+        self.transposition_table.store(board_hash, depth, max_value, flag, best_move)
+        
+        return max_value
+    
+    def _has_null_move_material(self, position, player_color):
+        """Kiểm tra bên đi còn Xe, Mã hoặc Pháo (chỉ còn Tốt, Sĩ, Tượng thì không bỏ lượt)"""
+        pieces = position.pieces
+        return any(pieces[code * player_color + 7] for code in (HORSE, CHARIOT, CANNON))
+    
+    def _record_cutoff(self, move, depth, killers, previous_move):
+        """Cập nhật nước "sát thủ", điểm lịch sử và nước đáp trả khi nước thường gây cắt tỉa beta"""
+        if move != killers[0]:
+            killers[1] = killers[0]
+            killers[0] = move
+        
+        # Cắt tỉa ở độ sâu lớn có giá trị hơn
+        self.history[move] += depth * depth
+        if self.history[move] > HISTORY_MAX:
+            self._age_history()
+        
+        if previous_move:
+            self.counter_moves[previous_move] = move
+    
+    def _age_history(self):
+        """Chia đôi điểm lịch sử để thông tin cũ mờ dần"""
+        self.history = [score >> 1 for score in self.history]
+    
+    def _check_time(self):
+        """Đếm nút và định kỳ kiểm tra hạn thời gian, hết giờ thì dừng tìm kiếm"""
+        self.nodes += 1
+        if not self.nodes & (NODE_CHECK_INTERVAL - 1) and (
+                time.time() >= self.deadline or self.nodes >= self.max_nodes):
+            raise SearchTimeout()
+    
+    def _quiescence(self, position, alpha, beta, player_color, ply=0):
+        """
+        Tìm kiếm tĩnh ở cuối cây để tránh hiệu ứng đường chân trời
+        
+        Chỉ xét các nước ăn quân, hoặc mọi nước thoát chiếu khi đang bị chiếu.
+        
+        Args:
+            position: Thế cờ
+            alpha, beta: Cửa sổ tìm kiếm
+            player_color: Bên đến lượt đi
+            ply: Số nước đã đi trong tìm kiếm tĩnh
+        """
+        self._check_time()
+        squares = position.squares
+        opponent_color = self._get_opponent(player_color)
+        
+        if self._is_in_check(position, player_color):
+            # Đang bị chiếu: không được "đứng yên", phải xét mọi nước thoát chiếu
+            moves = self._get_all_valid_moves(position, player_color)
+            if not moves:
+                return -10000  # Bị chiếu hết
+            stand_pat = None
+            best_value = float('-inf')
+        else:
+            # Đánh giá "đứng yên": bên đi có quyền không ăn quân
+            stand_pat = self._evaluate_board(position, player_color)
+            if stand_pat >= beta or ply >= QUIESCENCE_MAX_PLY:
+                return stand_pat
+            alpha = max(alpha, stand_pat)
+            best_value = stand_pat
+            moves = generate_captures(position, player_color)
+            
+            # MVV/LVA: ăn quân giá trị cao bằng quân giá trị thấp trước
+            moves.sort(key=lambda m: 10 * self._get_piece_value(squares[m & 127], m & 127)
+                       - self._get_piece_value(squares[m >> 7], m >> 7), reverse=True)
+        
+        for move in moves:
+            if stand_pat is not None:
+                # Cắt tỉa delta: ăn được quân này cũng không thể vượt alpha
+                gain = self._get_piece_value(squares[move_dst(move)], move_dst(move))
+                if stand_pat + gain + DELTA_MARGIN <= alpha:
+                    continue
+                # Bỏ nước ăn quân bị lỗ sau chuỗi trao đổi trên ô đích
+                if see(position, move) < 0:
+                    continue
+            
+            position.make_move(move)
+            if stand_pat is not None and self._is_in_check(position, player_color):
+                position.unmake_move()  # Nước ăn quân để tướng mình bị chiếu
+                continue
+            value = -self._quiescence(position, -beta, -alpha, opponent_color, ply + 1)
+            position.unmake_move()
+            
+            if value > best_value:
+                best_value = value
+            if value > alpha:
+                alpha = value
+            if alpha >= beta:
+                break  # Cắt tỉa Beta
+        
+        return best_value
+    
+    def _order_moves(self, position, moves, player_color, hash_move=0):
+        """Sắp xếp nước đi để tối ưu Alpha-Beta"""
+        squares = position.squares
+        move_scores = []
+        
+        for move in moves:
+            start_sq = move_src(move)
+            end_sq = move_dst(move)
+            piece = squares[start_sq]
+            target = squares[end_sq]
+            
+            # Tính điểm cho nước đi
+            score = 0
+            
+            # 1. Nước ăn quân - MVV/LVA (Most Valuable Victim / Least Valuable Aggressor),
+            #    nước ăn bị lỗ theo SEE bị xếp xuống dưới các nước thường
+            if target:
+                exchange = see(position, move)
+                if exchange < 0:
+                    score += exchange
+                else:
+                    target_value = self._get_piece_value(target, end_sq)
+                    attacker_value = self._get_piece_value(piece, start_sq)
+                    score += 10 * target_value - attacker_value
+                
+            # 2. Nước thăng cấp cho tốt
+            if abs(piece) == SOLDIER:
+                end_row = SQUARE_COORDS[end_sq][0]
+                if (piece > 0 and end_row < 5) or (piece < 0 and end_row > 4):
+                    score += 300
+                    
+            # 3. Nước đi vào vị trí tốt
+            score += self._get_position_value(piece, end_sq) * 2
+            
+            # 4. Nước chiếu tướng
+            if self._is_check_move(position, move, player_color):
+                score += 500
+                
+            # 5. Từ lịch sử nước đi
+            score += self.history[move]
+            
+            # 6. Nước tốt nhất lưu trong bảng chuyển vị
+            if move == hash_move:
+                score += 1000000
+            
+            move_scores.append((move, score))
+            
+        # Sắp xếp nước đi theo điểm cao nhất
+        return [move for move, score in sorted(move_scores, key=lambda x: x[1], reverse=True)]
+    
+    def _is_check_move(self, position, move, player_color):
+        """Kiểm tra nước đi có chiếu tướng đối phương không"""
+        position.make_move(move)
+        check = self._is_in_check(position, self._get_opponent(player_color))
+        position.unmake_move()
+        return check
+    
+    def _get_piece_value(self, piece, sq):
+        """
+        Trả về giá trị cơ bản của quân cờ
+        
+        Args:
+            piece: Mã quân cờ (dương là quân đỏ, âm là quân đen)
+            sq: Ô của quân cờ
+        """
+        if not piece:
+            return 0
+            
+        piece_type = abs(piece)
+        
+        if piece_type == GENERAL:
+            return 10000
+        elif piece_type == ADVISOR:
+            return 200
+        elif piece_type == ELEPHANT:
+            return 200
+        elif piece_type == HORSE:
+            return 400
+        elif piece_type == CHARIOT:
+            return 900
+        elif piece_type == CANNON:
+            return 450
+        elif piece_type == SOLDIER:
+            # Kiểm tra tốt qua sông
+            row = SQUARE_COORDS[sq][0]
+            if (piece > 0 and row < 5) or (piece < 0 and row > 4):
+                return 200
+            return 100
+        return 0
+    
+    def _get_position_value(self, piece, sq):
+        """Lấy giá trị vị trí của quân cờ"""
+        if not piece:
+            return 0
+            
+        piece_type = PIECE_NAMES[abs(piece)]
+        
+        if piece_type not in POSITION_VALUES:
+            return 0
+            
+        # Đảo ngược bảng cho quân đen
+        row, col = SQUARE_COORDS[sq]
+        if piece > 0:
+            return POSITION_VALUES[piece_type][row][col]
+        else:
+            return POSITION_VALUES[piece_type][9-row][col]
+    
+    def _evaluate_board(self, position, player_color):
+        """Đánh giá trạng thái bàn cờ"""
+        my_score = 0
+        opponent_score = 0
+        opponent_color = self._get_opponent(player_color)
+        
+        # Vật chất + vị trí: tổng điểm được cập nhật tăng dần khi đi/hoàn tác nước đi
+        if position.pst is PIECE_SQUARE_TABLE:
+            material = position.score
+        else:
+            material = pst_score(position, PIECE_SQUARE_TABLE)
+        my_score += material * player_color
+        
+        # Đánh giá tình hình chiến thuật
+        my_tactics = self._evaluate_tactics(position, player_color)
+        opponent_tactics = self._evaluate_tactics(position, opponent_color)
+        
+        my_score += my_tactics
+        opponent_score += opponent_tactics
+        
+        # Đánh giá trạng thái chiếu tướng
+        if self._is_in_check(position, opponent_color):
+            my_score += 100  # Chiếu tướng đối phương
+        if self._is_in_check(position, player_color):
+            opponent_score += 100  # Bị đối phương chiếu tướng
+        
+        # Bản đồ tấn công giả hợp lệ của hai bên: tạo một lần rồi dùng chung cho
+        # độ cơ động và an toàn của Tướng (không sinh nước hợp lệ ở mỗi lá)
+        my_attacks = attack_map(position, player_color)
+        opponent_attacks = attack_map(position, opponent_color)
+        
+        # Tính điểm di chuyển (mobility)
+        my_mobility = sum(my_attacks) * TACTICS_BONUS["mobility"]
+        opponent_mobility = sum(opponent_attacks) * TACTICS_BONUS["mobility"]
+        
+        my_score += my_mobility
+        opponent_score += opponent_mobility
+        
+        # Đánh giá an toàn của Tướng và sự tiến triển của Tốt
+        king_safety_score = (self._evaluate_king_safety(position, player_color, opponent_attacks) -
+                             self._evaluate_king_safety(position, opponent_color, my_attacks))
+        pawn_score = (self._evaluate_pawn_advancement(position, player_color) -
+                      self._evaluate_pawn_advancement(position, opponent_color))
+        
+        my_score += king_safety_score * FEATURE_WEIGHTS["king_safety"]
+        my_score += pawn_score * FEATURE_WEIGHTS["pawn_advancement"]
+        
+        return my_score - opponent_score
+    
+    def _evaluate_tactics(self, position, player_color):
+        """Đánh giá chiến thuật"""
+        tactics_score = 0
+        squares = position.squares
+        
+        # Vị trí các quân theo loại, lấy thẳng từ danh sách quân
+        piece_lists = position.pieces
+        pieces = position.piece_squares(player_color)
+        chariots = [SQUARE_COORDS[sq] for sq in piece_lists[CHARIOT * player_color + 7]]
+        cannons = [SQUARE_COORDS[sq] for sq in piece_lists[CANNON * player_color + 7]]
+        horses = piece_lists[HORSE * player_color + 7]
+        pawns = [SQUARE_COORDS[sq] for sq in piece_lists[SOLDIER * player_color + 7]]
+        general_sq = position.generals[player_color]
+        general_pos = SQUARE_COORDS[general_sq] if general_sq >= 0 else None
+        
+        # Kiểm soát trung tâm
+        center_pieces = []
+        for piece, sq in pieces:
+            row, col = SQUARE_COORDS[sq]
+            if 3 <= row <= 6 and 3 <= col <= 5:
+                center_pieces.append((row, col))
+        tactics_score += len(center_pieces) * TACTICS_BONUS["control_center"]
+        
+        # Xe liên kết
+        if len(chariots) >= 2:
+            for i in range(len(chariots)):
+                for j in range(i+1, len(chariots)):
+                    r1, c1 = chariots[i]
+                    r2, c2 = chariots[j]
+                    if r1 == r2 or c1 == c2:
+                        # Kiểm tra không có quân nào chặn giữa
+                        blocked = False
+                        if r1 == r2:  # Cùng hàng ngang
+                            start_c, end_c = min(c1, c2), max(c1, c2)
+                            for c in range(start_c + 1, end_c):
+                                if squares[square(r1, c)]:
+                                    blocked = True
+                                    break
+                        else:  # Cùng hàng dọc
+                            start_r, end_r = min(r1, r2), max(r1, r2)
+                            for r in range(start_r + 1, end_r):
+                                if squares[square(r, c1)]:
+                                    blocked = True
+                                    break
+                        if not blocked:
+                            tactics_score += TACTICS_BONUS["connected_chariots"]
+        
+        # Tướng được bảo vệ
+        if general_pos:
+            gen_row, gen_col = general_pos
+            protected = False
+            for piece, sq in pieces:
+                if abs(piece) in (ADVISOR, ELEPHANT):
+                    # Kiểm tra sĩ, tượng bảo vệ tướng
+                    row, col = SQUARE_COORDS[sq]
+                    if abs(row - gen_row) <= 1 and abs(col - gen_col) <= 1:
+                        protected = True
+                        break
+            if protected:
+                tactics_score += TACTICS_BONUS["protected_general"]
+        
+        # Tốt tiến xa
+        for row, col in pawns:
+            is_red = player_color == RED
+            if (is_red and row < 3) or (not is_red and row > 6):
+                tactics_score += TACTICS_BONUS["advanced_pawn"]
+        
+        # Pháo đôi
+        if len(cannons) >= 2:
+            for i in range(len(cannons)):
+                for j in range(i+1, len(cannons)):
+                    r1, c1 = cannons[i]
+                    r2, c2 = cannons[j]
+                    if r1 == r2 or c1 == c2:
+                        tactics_score += TACTICS_BONUS["doubled_cannons"]
+        
+        # Cặp mã
+        if len(horses) >= 2:
+            tactics_score += TACTICS_BONUS["horse_pair"]
+        
+        # Vị trí tấn công - quân ở nửa sân đối phương
+        attack_pieces = []
+        for piece, sq in pieces:
+            row = SQUARE_COORDS[sq][0]
+            is_red = player_color == RED
+            if (is_red and row < 5) or (not is_red and row > 4):
+                attack_pieces.append(sq)
+        tactics_score += len(attack_pieces) * TACTICS_BONUS["attacking_position"]
+        
+        return tactics_score
+    
+    def _evaluate_king_safety(self, position, color, enemy_attacks=None):
+        """
+        Đánh giá an toàn của Tướng
+        
+        Args:
+            position: Thế cờ
+            color: Bên có Tướng cần đánh giá
+            enemy_attacks: Bản đồ tấn công của đối phương (xem movegen.attack_map),
+                           tự tính nếu không truyền vào
+        """
+        safety_score = 100  # Điểm cơ bản
+        
+        # Vị trí Tướng được lưu sẵn trong thế cờ
+        king_sq = position.generals[color]
+        if king_sq < 0:
+            return -10000  # Tướng đã bị bắt, điểm rất thấp
+        
+        # Đếm Sĩ và Tượng còn lại
+        pieces = position.pieces
+        protectors = len(pieces[ADVISOR * color + 7]) + len(pieces[ELEPHANT * color + 7])
+        
+        # Cộng điểm cho mỗi quân bảo vệ
+        safety_score += protectors * 10
+        
+        # Kiểm tra số quân tấn công hướng đến Tướng
+        if enemy_attacks is None:
+            enemy_attacks = attack_map(position, -color)
+        attackers = enemy_attacks[king_sq]
+        
+        # Trừ điểm cho mỗi quân tấn công
+        safety_score -= attackers * 20
+        
+        # Kiểm tra "Tướng đối diện"
+        if generals_facing(position):
+            safety_score -= 50
+        
+        return safety_score
+    
+    def _evaluate_pawn_advancement(self, position, color):
+        """Đánh giá sự tiến triển của Tốt/Binh"""
+        score = 0
+        
+        for sq in position.pieces[SOLDIER * color + 7]:
+            row = SQUARE_COORDS[sq][0]
+            if color == RED:
+                # Tốt đỏ càng lên trên (row càng nhỏ) càng tốt
+                score += (9 - row) * 2
+                # Cộng thêm điểm nếu đã qua sông
+                if row < 5:
+                    score += 10
+            else:  # black
+                # Tốt đen càng xuống dưới (row càng lớn) càng tốt
+                score += row * 2
+                # Cộng thêm điểm nếu đã qua sông
+                if row > 4:
+                    score += 10
+        
+        return score
+    
+    def _get_all_valid_moves(self, position, player_color):
+        """Trả về tất cả các nước đi hợp lệ"""
+        # Sinh nước đi từ bảng nước đi tính sẵn, loại nước tự chiếu nhờ quân ghim
+        return generate_legal_moves(position, player_color)
+    
+    def _causes_self_check(self, position, move, player_color):
+        """Kiểm tra nước đi có gây ra tự chiếu tướng không"""
+        # Thực hiện nước đi ngay trên thế cờ
+        position.make_move(move)
+        
+        # Kiểm tra tướng có bị chiếu không
+        check = self._is_in_check(position, player_color)
+        
+        # Hoàn tác nước đi
+        position.unmake_move()
+        return check
+    
+    def _is_in_check(self, position, player_color):
+        """Kiểm tra một người chơi có đang bị chiếu tướng không"""
+        return in_check(position, player_color)
+    
+    def _is_game_over(self, position):
+        """Kiểm tra trò chơi đã kết thúc chưa"""
+        # Một trong hai tướng đã bị ăn
+        return position.generals[RED] < 0 or position.generals[BLACK] < 0
+    
+    def _get_opponent(self, player_color):
+        """Trả về màu đối thủ"""
+        return BLACK if player_color == RED else RED 
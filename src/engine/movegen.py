@@ -0,0 +1,534 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Sinh nước đi cho AI trên thế cờ Position dựa trên các bảng tính sẵn
+trong movetables.py thay vì thử is_valid_move với cả 90 ô của bàn cờ.
+
+Nước đi được mã hóa thành số nguyên (xem movetables.encode_move).
+"""
+
+from .movetables import (
+    GENERAL, ADVISOR, ELEPHANT, HORSE, CHARIOT, CANNON, SOLDIER, BOARD_COLS,
+    BOARD_ROWS, BOARD_SIZE, SQUARE_COORDS, GENERAL_MOVES, ADVISOR_MOVES,
+    ELEPHANT_MOVES, HORSE_MOVES, SOLDIER_MOVES, HORSE_ATTACKS, SOLDIER_ATTACKS,
+    RANK_SLIDES, FILE_SLIDES, RANK_CONTROLS, FILE_CONTROLS,
+)
+
+
+def _slider_moves(position, sq, piece_type, side, moves):
+    """
+    Sinh nước đi của Xe/Pháo: mỗi hướng chỉ tra bảng trượt một lần
+
+    Args:
+        position: Thế cờ
+        sq: Ô của quân cờ
+        piece_type: CHARIOT hoặc CANNON
+        side: Bên của quân cờ
+        moves: Danh sách để thêm nước đi vào
+    """
+    squares = position.squares
+    row, col = SQUARE_COORDS[sq]
+    row_base = row * BOARD_COLS
+    base = sq << 7
+    rank_lo, rank_hi, rank_lo2, rank_hi2 = RANK_SLIDES[col][position.ranks[row]]
+    file_lo, file_hi, file_lo2, file_hi2 = FILE_SLIDES[row][position.files[col]]
+
+    # Nước đi thường: các ô trống giữa hai quân chặn gần nhất
+    for c in range(rank_lo + 1, col):
+        moves.append(base | row_base + c)
+    for c in range(col + 1, rank_hi):
+        moves.append(base | row_base + c)
+    for r in range(file_lo + 1, row):
+        moves.append(base | r * BOARD_COLS + col)
+    for r in range(row + 1, file_hi):
+        moves.append(base | r * BOARD_COLS + col)
+
+    # Nước ăn quân: Xe ăn quân chặn gần nhất, Pháo ăn quân sau "ngòi"
+    if piece_type == CHARIOT:
+        targets = (rank_lo, rank_hi, file_lo, file_hi)
+    else:
+        targets = (rank_lo2, rank_hi2, file_lo2, file_hi2)
+    _slider_captures(squares, sq, side, targets, moves)
+
+
+def _slider_captures(squares, sq, side, targets, moves):
+    """Thêm nước ăn quân của Xe/Pháo theo 4 ô mục tiêu (trái, phải, trên, dưới)"""
+    row, col = SQUARE_COORDS[sq]
+    row_base = row * BOARD_COLS
+    base = sq << 7
+    left, right, up, down = targets
+    if left >= 0 and squares[row_base + left] * side < 0:
+        moves.append(base | row_base + left)
+    if right < BOARD_COLS and squares[row_base + right] * side < 0:
+        moves.append(base | row_base + right)
+    if up >= 0 and squares[up * BOARD_COLS + col] * side < 0:
+        moves.append(base | up * BOARD_COLS + col)
+    if down < BOARD_ROWS and squares[down * BOARD_COLS + col] * side < 0:
+        moves.append(base | down * BOARD_COLS + col)
+
+
+def _piece_moves(position, sq, piece, moves):
+    """Thêm các nước đi giả hợp lệ của quân cờ tại ô sq vào danh sách moves"""
+    squares = position.squares
+    side = 1 if piece > 0 else -1
+    piece_type = piece * side
+    base = sq << 7
+
+    # Quân đi theo bước cố định: duyệt danh sách ngắn trong bảng
+    if piece_type == HORSE:
+        for to, leg in HORSE_MOVES[sq]:
+            if not squares[leg] and squares[to] * side <= 0:
+                moves.append(base | to)
+    elif piece_type == CHARIOT or piece_type == CANNON:
+        _slider_moves(position, sq, piece_type, side, moves)
+    elif piece_type == SOLDIER:
+        for to in SOLDIER_MOVES[side][sq]:
+            if squares[to] * side <= 0:
+                moves.append(base | to)
+    elif piece_type == ELEPHANT:
+        for to, eye in ELEPHANT_MOVES[side][sq]:
+            if not squares[eye] and squares[to] * side <= 0:
+                moves.append(base | to)
+    elif piece_type == ADVISOR:
+        for to in ADVISOR_MOVES[side][sq]:
+            if squares[to] * side <= 0:
+                moves.append(base | to)
+    elif piece_type == GENERAL:
+        for to in GENERAL_MOVES[side][sq]:
+            if squares[to] * side <= 0:
+                moves.append(base | to)
+
+
+def _piece_captures(position, sq, piece, moves):
+    """Thêm các nước ăn quân giả hợp lệ của quân cờ tại ô sq vào danh sách moves"""
+    squares = position.squares
+    side = 1 if piece > 0 else -1
+    piece_type = piece * side
+    base = sq << 7
+
+    if piece_type == HORSE:
+        for to, leg in HORSE_MOVES[sq]:
+            if squares[to] * side < 0 and not squares[leg]:
+                moves.append(base | to)
+    elif piece_type == CHARIOT or piece_type == CANNON:
+        row, col = SQUARE_COORDS[sq]
+        rank = RANK_SLIDES[col][position.ranks[row]]
+        file = FILE_SLIDES[row][position.files[col]]
+        if piece_type == CHARIOT:
+            targets = (rank[0], rank[1], file[0], file[1])
+        else:
+            targets = (rank[2], rank[3], file[2], file[3])
+        _slider_captures(squares, sq, side, targets, moves)
+    else:
+        if piece_type == SOLDIER:
+            table = SOLDIER_MOVES[side][sq]
+        elif piece_type == ADVISOR:
+            table = ADVISOR_MOVES[side][sq]
+        elif piece_type == GENERAL:
+            table = GENERAL_MOVES[side][sq]
+        else:
+            table = [to for to, eye in ELEPHANT_MOVES[side][sq] if not squares[eye]]
+        for to in table:
+            if squares[to] * side < 0:
+                moves.append(base | to)
+
+
+def piece_moves(position, sq):
+    """
+    Lấy các nước đi giả hợp lệ (chưa kiểm tra tự chiếu tướng) của quân tại ô sq
+
+    Returns:
+        list: Danh sách nước đi dạng số nguyên
+    """
+    moves = []
+    if position.squares[sq]:
+        _piece_moves(position, sq, position.squares[sq], moves)
+    return moves
+
+
+def is_pseudo_legal(position, move, side=None):
+    """
+    Kiểm tra nước đi (ví dụ lấy từ bảng chuyển vị) có hợp lệ theo cách đi
+    của quân cờ trong thế cờ hiện tại không (chưa kiểm tra tự chiếu tướng)
+    """
+    if side is None:
+        side = position.side
+    src = move >> 7
+    if position.squares[src] * side <= 0:
+        return False
+    return move in piece_moves(position, src)
+
+
+def generate_moves(position, side=None):
+    """
+    Sinh tất cả nước đi giả hợp lệ (chưa kiểm tra tự chiếu tướng) của một bên
+
+    Args:
+        position: Thế cờ
+        side: Bên cần sinh nước đi (mặc định là bên đến lượt)
+
+    Returns:
+        list: Danh sách nước đi dạng số nguyên
+    """
+    if side is None:
+        side = position.side
+    moves = []
+    for piece, sq in position.piece_squares(side):
+        _piece_moves(position, sq, piece, moves)
+    return moves
+
+
+def generate_captures(position, side=None):
+    """
+    Sinh các nước ăn quân giả hợp lệ của một bên (dùng cho tìm kiếm tĩnh)
+
+    Args:
+        position: Thế cờ
+        side: Bên cần sinh nước đi (mặc định là bên đến lượt)
+
+    Returns:
+        list: Danh sách nước ăn quân dạng số nguyên
+    """
+    if side is None:
+        side = position.side
+    moves = []
+    for piece, sq in position.piece_squares(side):
+        _piece_captures(position, sq, piece, moves)
+    return moves
+
+
+def attack_map(position, side):
+    """
+    Bản đồ tấn công của một bên (chưa kiểm tra tự chiếu tướng)
+
+    Mỗi quân được tính cho mọi ô nó khống chế: ô trống đi tới được, ô có
+    quân đối phương ăn được và cả ô có quân mình (được bảo vệ). Pháo khống
+    chế các ô trống trước "ngòi" và quân đầu tiên sau "ngòi". Các phần tử
+    được cộng thẳng từ bảng nước đi và bảng trượt, không tạo danh sách
+    nước đi.
+
+    Dùng cho hàm đánh giá: tổng các phần tử là độ cơ động, phần tử tại ô
+    Tướng đối phương là số quân đang nhắm vào Tướng.
+
+    Returns:
+        list: 90 phần tử, mỗi phần tử là số quân của side khống chế ô đó
+    """
+    counts = [0] * BOARD_SIZE
+    squares = position.squares
+    pieces = position.pieces
+    ranks = position.ranks
+    files = position.files
+
+    for sq in pieces[GENERAL * side + 7]:
+        for to in GENERAL_MOVES[side][sq]:
+            counts[to] += 1
+    for sq in pieces[ADVISOR * side + 7]:
+        for to in ADVISOR_MOVES[side][sq]:
+            counts[to] += 1
+    for sq in pieces[ELEPHANT * side + 7]:
+        for to, eye in ELEPHANT_MOVES[side][sq]:
+            if not squares[eye]:
+                counts[to] += 1
+    for sq in pieces[HORSE * side + 7]:
+        for to, leg in HORSE_MOVES[sq]:
+            if not squares[leg]:
+                counts[to] += 1
+    for sq in pieces[SOLDIER * side + 7]:
+        for to in SOLDIER_MOVES[side][sq]:
+            counts[to] += 1
+
+    # Xe (chỉ số 0) và Pháo (chỉ số 1): tra bảng ô khống chế theo hàng và cột
+    for kind, piece_type in enumerate((CHARIOT, CANNON)):
+        for sq in pieces[piece_type * side + 7]:
+            row, col = SQUARE_COORDS[sq]
+            row_base = sq - col
+            for c in RANK_CONTROLS[col][ranks[row]][kind]:
+                counts[row_base + c] += 1
+            for r in FILE_CONTROLS[row][files[col]][kind]:
+                counts[r + col] += 1
+    return counts
+
+
+def attackers(position, sq, side):
+    """
+    Tìm các quân của một bên đang tấn công (ăn được) ô sq, nhìn ra từ chính ô đó
+
+    Xe/Pháo tra bảng trượt tại ô sq (quân chặn gần nhất là Xe, quân thứ hai
+    là Pháo có "ngòi"), Mã dùng bảng ngược kèm ô "chân mã", Tốt dùng bảng
+    ngược, còn Tướng/Sĩ/Tượng đi đối xứng nên dùng luôn bảng nước đi (đã
+    giới hạn trong cung điện/nửa bàn cờ). Tướng đối mặt trên cùng cột cũng
+    được tính là tấn công Tướng đối phương.
+
+    Returns:
+        list: Các cặp (ô, mã quân) của quân tấn công
+    """
+    squares = position.squares
+    row, col = SQUARE_COORDS[sq]
+    row_base = row * BOARD_COLS
+    found = []
+
+    # Xe, Pháo (và Tướng đối mặt) theo hàng ngang/cột dọc
+    rank_lo, rank_hi, rank_lo2, rank_hi2 = RANK_SLIDES[col][position.ranks[row]]
+    file_lo, file_hi, file_lo2, file_hi2 = FILE_SLIDES[row][position.files[col]]
+    for near, far in ((rank_lo, rank_lo2), (rank_hi, rank_hi2)):
+        if 0 <= near < BOARD_COLS and squares[row_base + near] == CHARIOT * side:
+            found.append((row_base + near, CHARIOT * side))
+        if 0 <= far < BOARD_COLS and squares[row_base + far] == CANNON * side:
+            found.append((row_base + far, CANNON * side))
+    for near, far in ((file_lo, file_lo2), (file_hi, file_hi2)):
+        if 0 <= near < BOARD_ROWS:
+            piece = squares[near * BOARD_COLS + col]
+            if piece == CHARIOT * side or (piece == GENERAL * side and squares[sq] == -GENERAL * side):
+                found.append((near * BOARD_COLS + col, piece))
+        if 0 <= far < BOARD_ROWS and squares[far * BOARD_COLS + col] == CANNON * side:
+            found.append((far * BOARD_COLS + col, CANNON * side))
+
+    # Mã: ô "chân mã" của chính con Mã phải trống
+    for src, leg in HORSE_ATTACKS[sq]:
+        if squares[src] == HORSE * side and not squares[leg]:
+            found.append((src, HORSE * side))
+
+    # Tốt, Sĩ, Tượng, Tướng
+    for src in SOLDIER_ATTACKS[side][sq]:
+        if squares[src] == SOLDIER * side:
+            found.append((src, SOLDIER * side))
+    for src in ADVISOR_MOVES[side][sq]:
+        if squares[src] == ADVISOR * side:
+            found.append((src, ADVISOR * side))
+    for src, eye in ELEPHANT_MOVES[side][sq]:
+        if squares[src] == ELEPHANT * side and not squares[eye]:
+            found.append((src, ELEPHANT * side))
+    for src in GENERAL_MOVES[side][sq]:
+        if squares[src] == GENERAL * side:
+            found.append((src, GENERAL * side))
+    return found
+
+
+def is_square_attacked(position, sq, side):
+    """
+    Kiểm tra ô sq có bị quân của một bên tấn công không, nhìn ra từ chính ô đó
+
+    Giống attackers() nhưng dừng ngay khi gặp quân tấn công đầu tiên nên rẻ
+    hơn nhiều so với sinh toàn bộ nước đi của đối phương. Đây là hàm nóng
+    nhất của engine: mọi phép kiểm tra chiếu tướng đều đi qua đây.
+
+    Args:
+        position: Thế cờ
+        sq: Ô cần kiểm tra (thường là ô của Tướng)
+        side: Bên tấn công
+
+    Returns:
+        bool: True nếu có quân của side ăn được quân trên ô sq
+    """
+    squares = position.squares
+    row, col = SQUARE_COORDS[sq]
+    row_base = row * BOARD_COLS
+
+    # Xe theo quân chặn gần nhất, Pháo theo quân thứ hai (sau "ngòi")
+    chariot = CHARIOT * side
+    cannon = CANNON * side
+    rank_lo, rank_hi, rank_lo2, rank_hi2 = RANK_SLIDES[col][position.ranks[row]]
+    if rank_lo >= 0 and squares[row_base + rank_lo] == chariot:
+        return True
+    if rank_hi < BOARD_COLS and squares[row_base + rank_hi] == chariot:
+        return True
+    if rank_lo2 >= 0 and squares[row_base + rank_lo2] == cannon:
+        return True
+    if rank_hi2 < BOARD_COLS and squares[row_base + rank_hi2] == cannon:
+        return True
+
+    # Trên cột dọc còn có Tướng đối mặt (chỉ khi ô sq là Tướng đối phương)
+    file_lo, file_hi, file_lo2, file_hi2 = FILE_SLIDES[row][position.files[col]]
+    general = GENERAL * side if squares[sq] == -GENERAL * side else chariot
+    if file_lo >= 0:
+        piece = squares[file_lo * BOARD_COLS + col]
+        if piece == chariot or piece == general:
+            return True
+    if file_hi < BOARD_ROWS:
+        piece = squares[file_hi * BOARD_COLS + col]
+        if piece == chariot or piece == general:
+            return True
+    if file_lo2 >= 0 and squares[file_lo2 * BOARD_COLS + col] == cannon:
+        return True
+    if file_hi2 < BOARD_ROWS and squares[file_hi2 * BOARD_COLS + col] == cannon:
+        return True
+
+    # Mã: ô "chân mã" của chính con Mã phải trống
+    horse = HORSE * side
+    for src, leg in HORSE_ATTACKS[sq]:
+        if squares[src] == horse and not squares[leg]:
+            return True
+
+    # Tốt ở các ô kề
+    soldier = SOLDIER * side
+    for src in SOLDIER_ATTACKS[side][sq]:
+        if squares[src] == soldier:
+            return True
+
+    # Sĩ, Tượng, Tướng chỉ tấn công được trong cung điện/nửa bàn cờ của mình
+    advisor = ADVISOR * side
+    for src in ADVISOR_MOVES[side][sq]:
+        if squares[src] == advisor:
+            return True
+    elephant = ELEPHANT * side
+    for src, eye in ELEPHANT_MOVES[side][sq]:
+        if squares[src] == elephant and not squares[eye]:
+            return True
+    general = GENERAL * side
+    for src in GENERAL_MOVES[side][sq]:
+        if squares[src] == general:
+            return True
+    return False
+
+
+def generals_facing(position):
+    """Kiểm tra hai tướng có đối mặt trực tiếp trên cùng một cột không"""
+    red_general = position.generals[GENERAL]
+    if red_general < 0:
+        return False
+    row, col = SQUARE_COORDS[red_general]
+    blocker = FILE_SLIDES[row][position.files[col]][0]
+    return blocker >= 0 and position.squares[blocker * BOARD_COLS + col] == -GENERAL
+
+
+def in_check(position, side):
+    """
+    Kiểm tra một bên có đang bị chiếu tướng không
+
+    Dùng vị trí Tướng được lưu sẵn trong thế cờ và is_square_attacked().
+    Hai tướng đối mặt cũng được tính là bị chiếu.
+    """
+    general = position.generals[side]
+    if general < 0:
+        return True  # Không còn tướng, coi như đã thua
+    return is_square_attacked(position, general, -side)
+
+
+# Bốn hướng nhìn ra từ Tướng: (bước hàng, bước cột)
+_DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+def _add_pin(pins, sq, allowed):
+    """Ghi nhận quân bị ghim tại ô sq chỉ được đi đến các ô allowed (giao với ràng buộc cũ)"""
+    if sq in pins:
+        pins[sq] = pins[sq] & allowed
+    else:
+        pins[sq] = allowed
+
+
+def find_pins(position, side):
+    """
+    Tìm các quân bị ghim và các ô cấm đặt quân của một bên (khi Tướng không bị chiếu)
+
+    Nhìn ra 4 hướng từ Tướng:
+    - Quân mình đứng một mình giữa Tướng và Xe đối phương (hoặc Tướng đối
+      phương trên cùng cột) chỉ được đi trong đoạn giữa hai quân hoặc ăn quân đó.
+    - Khi có đúng hai quân giữa Tướng và Pháo đối phương, quân mình trong đó
+      chỉ được đi đến ô trống trong đoạn giữa hoặc ăn Pháo (bớt một quân là
+      Pháo có "ngòi" để chiếu).
+    - Khi giữa Tướng và Pháo đối phương không có quân nào, các ô trống ở giữa
+      bị cấm: đặt quân vào đó là tạo "ngòi" cho Pháo.
+    Quân mình đứng ở "chân" của Mã đối phương đang nhắm vào Tướng thì chỉ
+    được đi để ăn chính con Mã đó.
+
+    Args:
+        position: Thế cờ
+        side: Bên cần xét
+
+    Returns:
+        tuple: (pins, forbidden) với pins là dict ô -> tập ô đích được phép,
+               forbidden là tập ô đích bị cấm với mọi quân (trừ Tướng)
+    """
+    squares = position.squares
+    general = position.generals[side]
+    row, col = SQUARE_COORDS[general]
+    pins = {}
+    forbidden = set()
+
+    for dr, dc in _DIRECTIONS:
+        # Các quân trên đường thẳng từ Tướng ra (tối đa 3 quân đầu tiên)
+        empty = []
+        found = []
+        r, c = row + dr, col + dc
+        while 0 <= r < BOARD_ROWS and 0 <= c < BOARD_COLS and len(found) < 3:
+            sq = r * BOARD_COLS + c
+            if squares[sq]:
+                found.append(sq)
+            else:
+                empty.append((sq, len(found)))  # Ô trống kèm số quân đứng trước nó
+            r += dr
+            c += dc
+
+        # Pháo đối phương chưa có "ngòi"
+        if found and squares[found[0]] == CANNON * -side:
+            forbidden.update(sq for sq, before in empty if not before)
+
+        if len(found) >= 2 and squares[found[0]] * side > 0:
+            attacker = squares[found[1]]
+            if attacker == CHARIOT * -side or (dc == 0 and attacker == GENERAL * -side):
+                allowed = {sq for sq, before in empty if before < 2}
+                allowed.add(found[1])
+                _add_pin(pins, found[0], allowed)
+
+        if len(found) == 3 and squares[found[2]] == CANNON * -side:
+            allowed = {sq for sq, before in empty}
+            allowed.add(found[2])
+            for screen in found[:2]:
+                if squares[screen] * side > 0:
+                    _add_pin(pins, screen, allowed)
+
+    # Quân mình chặn "chân" của Mã đối phương
+    for src, leg in HORSE_ATTACKS[general]:
+        if squares[src] == HORSE * -side and squares[leg] * side > 0:
+            _add_pin(pins, leg, {src})
+
+    return pins, forbidden
+
+
+def generate_legal_moves(position, side=None):
+    """
+    Sinh tất cả nước đi hợp lệ (không để tướng mình bị chiếu) của một bên
+
+    Quân ghim và ô cấm được tính một lần cho cả thế cờ (xem find_pins) nên
+    phần lớn nước đi không cần thử đi rồi hoàn tác. Chỉ nước đi của Tướng
+    và trường hợp đang bị chiếu mới phải thử trực tiếp.
+
+    Returns:
+        list: Danh sách nước đi dạng số nguyên
+    """
+    if side is None:
+        side = position.side
+    general = position.generals[side]
+    if general < 0:
+        return []  # Không còn tướng, không có nước hợp lệ
+
+    moves = generate_moves(position, side)
+    if is_square_attacked(position, general, -side):
+        # Đang bị chiếu: thử từng nước
+        legal = []
+        for move in moves:
+            position.make_move(move)
+            if not in_check(position, side):
+                legal.append(move)
+            position.unmake_move()
+        return legal
+
+    pins, forbidden = find_pins(position, side)
+    legal = []
+    for move in moves:
+        src = move >> 7
+        dst = move & 127
+        if src == general:
+            # Tướng đổi ô: ô đích có thể bị tấn công theo nhiều cách, thử trực tiếp
+            position.make_move(move)
+            if not in_check(position, side):
+                legal.append(move)
+            position.unmake_move()
+        elif dst in forbidden:
+            continue
+        elif src in pins and dst not in pins[src]:
+            continue
+        else:
+            legal.append(move)
+    return legal
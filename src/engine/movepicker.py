@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Chọn nước đi theo từng giai đoạn cho tìm kiếm Alpha-Beta.
+
+Thay vì sinh và sắp xếp toàn bộ nước đi trước khi tìm kiếm, các nước được
+đưa ra lần lượt: nước trong bảng chuyển vị, nước ăn quân có lợi (MVV/LVA),
+nước "sát thủ" (killer), nước đáp trả (counter move), các nước thường theo
+điểm lịch sử, rồi cuối cùng là nước ăn quân bị lỗ theo đánh giá trao đổi
+tĩnh (SEE). Giai đoạn sau chỉ được sinh khi các nước của giai đoạn trước
+không gây cắt tỉa.
+
+Các nước đưa ra là giả hợp lệ: bên gọi phải tự bỏ qua nước để tướng mình
+bị chiếu sau khi thực hiện.
+"""
+
+from .movetables import GENERAL, ADVISOR, ELEPHANT, HORSE, CHARIOT, CANNON, SOLDIER
+from .movegen import generate_moves, generate_captures, is_pseudo_legal, attackers
+
+# Giá trị quân dùng cho MVV/LVA, chỉ số là mã loại quân
+ORDER_VALUES = [0] * 8
+ORDER_VALUES[GENERAL] = 10000
+ORDER_VALUES[ADVISOR] = 200
+ORDER_VALUES[ELEPHANT] = 200
+ORDER_VALUES[HORSE] = 400
+ORDER_VALUES[CHARIOT] = 900
+ORDER_VALUES[CANNON] = 450
+ORDER_VALUES[SOLDIER] = 100
+
+
+def mvv_lva(squares, move):
+    """Điểm MVV/LVA: ăn quân giá trị cao bằng quân giá trị thấp được ưu tiên"""
+    return 10 * ORDER_VALUES[abs(squares[move & 127])] - ORDER_VALUES[abs(squares[move >> 7])]
+
+
+def see(position, move):
+    """
+    Đánh giá trao đổi tĩnh (SEE): giải chuỗi ăn qua lại trên ô đích của nước ăn quân
+
+    Mỗi bên lần lượt ăn lại bằng quân rẻ nhất đang tấn công ô đích và có thể
+    dừng bất cứ lúc nào. Các nước ăn được thực hiện thật trên thế cờ (rồi
+    hoàn tác) nên "ngòi" của Pháo, "chân mã" và Xe ẩn phía sau đều được cập
+    nhật đúng; giới hạn cung điện nằm sẵn trong bảng nước đi.
+
+    Returns:
+        int: Lợi ích vật chất (theo ORDER_VALUES) của bên thực hiện nước đi
+    """
+    squares = position.squares
+    target = move & 127
+    side = -1 if squares[move >> 7] > 0 else 1  # Bên ăn lại tiếp theo
+    gains = [ORDER_VALUES[abs(squares[target])]]
+    position.make_move(move)
+    made = 1
+
+    # Ăn Tướng là kết thúc, không cần xét tiếp
+    while abs(gains[0]) < ORDER_VALUES[GENERAL] and gains[-1] < ORDER_VALUES[GENERAL]:
+        found = attackers(position, target, side)
+        if not found:
+            break
+        src = min(found, key=lambda attacker: ORDER_VALUES[abs(attacker[1])])[0]
+        gains.append(ORDER_VALUES[abs(squares[target])] - gains[-1])
+        position.make_move(src << 7 | target)
+        made += 1
+        side = -side
+
+    for _ in range(made):
+        position.unmake_move()
+
+    # Mỗi bên chỉ ăn tiếp khi có lợi
+    while len(gains) > 1:
+        last = gains.pop()
+        gains[-1] = -max(-gains[-1], last)
+    return gains[0]
+
+
+def pick_moves(position, side, hash_move=0, killers=(), history=None, counter_move=0):
+    """
+    Sinh nước đi giả hợp lệ theo từng giai đoạn (generator)
+
+    Args:
+        position: Thế cờ (có thể bị make/unmake giữa các lần lấy nước,
+                  miễn là được khôi phục trước khi lấy nước tiếp theo)
+        side: Bên đến lượt đi
+        hash_move: Nước tốt nhất lấy từ bảng chuyển vị (0 nếu không có)
+        killers: Các nước "sát thủ" đã gây cắt tỉa ở cùng độ sâu
+        history: Bảng điểm lịch sử đánh chỉ số theo nước đi, dùng để sắp xếp nước thường
+        counter_move: Nước đáp trả từng gây cắt tỉa sau nước vừa đi của đối phương
+
+    Yields:
+        int: Nước đi dạng số nguyên
+    """
+    squares = position.squares
+
+    # 1. Nước trong bảng chuyển vị
+    if hash_move and is_pseudo_legal(position, hash_move, side):
+        yield hash_move
+
+    # 2. Nước ăn quân có lợi theo MVV/LVA, nước ăn bị lỗ để dành đến cuối
+    captures = generate_captures(position, side)
+    captures.sort(key=lambda m: mvv_lva(squares, m), reverse=True)
+    losing_captures = []
+    for move in captures:
+        if move == hash_move:
+            continue
+        # Ăn quân không rẻ hơn quân mình thì không thể lỗ, khỏi tính SEE
+        if ORDER_VALUES[abs(squares[move & 127])] < ORDER_VALUES[abs(squares[move >> 7])]:
+            exchange = see(position, move)
+            if exchange < 0:
+                losing_captures.append((exchange, move))
+                continue
+        yield move
+
+    # 3. Nước "sát thủ" (chỉ nước không ăn quân, còn hợp lệ ở thế cờ này)
+    for move in killers:
+        if move and move != hash_move and not squares[move & 127] \
+                and is_pseudo_legal(position, move, side):
+            yield move
+
+    # 4. Nước đáp trả nước vừa đi của đối phương
+    if counter_move and counter_move != hash_move and counter_move not in killers \
+            and not squares[counter_move & 127] and is_pseudo_legal(position, counter_move, side):
+        yield counter_move
+    else:
+        counter_move = 0
+
+    # 5. Các nước thường còn lại theo điểm lịch sử
+    quiets = [m for m in generate_moves(position, side)
+              if not squares[m & 127] and m != hash_move and m != counter_move and m not in killers]
+    if history is not None:
+        quiets.sort(key=history.__getitem__, reverse=True)
+    yield from quiets
+
+    # 6. Nước ăn quân bị lỗ, lỗ ít trước
+    losing_captures.sort(reverse=True)
+    for exchange, move in losing_captures:
+        yield move
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Bảng nước đi tính sẵn cho các quân đi theo bước cố định
+(Tướng, Sĩ, Tượng, Mã, Tốt) và bảng trượt theo hàng/cột cho Xe, Pháo.
+
+Các bảng được xây dựng một lần khi import module. Ô cờ được đánh số
+phẳng từ 0 đến 89: square = row * 9 + col, hàng 0 là phía quân đen,
+hàng 9 là phía quân đỏ (giống bàn cờ trong board.py).
+"""
+
+# Kích thước bàn cờ
+BOARD_ROWS = 10
+BOARD_COLS = 9
+BOARD_SIZE = BOARD_ROWS * BOARD_COLS
+
+# Định nghĩa hằng số cho các bên
+RED = 1
+BLACK = -1
+
+# Mã loại quân cờ
+GENERAL = 1   # Tướng
+ADVISOR = 2   # Sĩ
+ELEPHANT = 3  # Tượng
+HORSE = 4     # Mã
+CHARIOT = 5   # Xe
+CANNON = 6    # Pháo
+SOLDIER = 7   # Tốt
+
+# Tên lớp quân cờ (trong pieces.py) tương ứng với từng mã
+PIECE_NAMES = {
+    GENERAL: "General",
+    ADVISOR: "Advisor",
+    ELEPHANT: "Elephant",
+    HORSE: "Horse",
+    CHARIOT: "Chariot",
+    CANNON: "Cannon",
+    SOLDIER: "Soldier",
+}
+PIECE_TYPES = {name: code for code, name in PIECE_NAMES.items()}
+
+# Tọa độ (row, col) của từng ô
+SQUARE_COORDS = [(sq // BOARD_COLS, sq % BOARD_COLS) for sq in range(BOARD_SIZE)]
+
+
+def square(row, col):
+    """Chuyển tọa độ (row, col) thành chỉ số ô"""
+    return row * BOARD_COLS + col
+
+
+# Số mã nước đi có thể có (kích thước cho các bảng đánh chỉ số theo nước đi)
+MOVE_SPACE = BOARD_SIZE << 7
+
+
+def encode_move(src, dst):
+    """Mã hóa nước đi thành số nguyên: 7 bit thấp là ô đích, phần còn lại là ô xuất phát"""
+    return src << 7 | dst
+
+
+def move_src(move):
+    """Lấy ô xuất phát của nước đi"""
+    return move >> 7
+
+
+def move_dst(move):
+    """Lấy ô đích của nước đi"""
+    return move & 127
+
+
+def move_to_coords(move):
+    """Chuyển nước đi dạng số nguyên thành ((from_row, from_col), (to_row, to_col))"""
+    return SQUARE_COORDS[move >> 7], SQUARE_COORDS[move & 127]
+
+
+def coords_to_move(from_pos, to_pos):
+    """Chuyển nước đi dạng ((from_row, from_col), (to_row, to_col)) thành số nguyên"""
+    return encode_move(square(*from_pos), square(*to_pos))
+
+
+def on_board(row, col):
+    """Kiểm tra tọa độ có nằm trong bàn cờ không"""
+    return 0 <= row < BOARD_ROWS and 0 <= col < BOARD_COLS
+
+
+def in_palace(side, row, col):
+    """Kiểm tra ô có nằm trong cung điện của một bên không"""
+    if not 3 <= col <= 5:
+        return False
+    if side == RED:
+        return 7 <= row <= 9
+    return 0 <= row <= 2
+
+
+def own_half(side, row):
+    """Kiểm tra hàng có nằm ở nửa bàn cờ (chưa qua sông) của một bên không"""
+    return row >= 5 if side == RED else row <= 4
+
+
+def _build_general_moves(side):
+    """Tướng: 1 ô ngang/dọc trong cung điện"""
+    table = []
+    for sq in range(BOARD_SIZE):
+        row, col = SQUARE_COORDS[sq]
+        moves = []
+        if in_palace(side, row, col):
+            for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+                if in_palace(side, row + dr, col + dc):
+                    moves.append(square(row + dr, col + dc))
+        table.append(tuple(moves))
+    return table
+
+
+def _build_advisor_moves(side):
+    """Sĩ: 1 ô chéo trong cung điện"""
+    table = []
+    for sq in range(BOARD_SIZE):
+        row, col = SQUARE_COORDS[sq]
+        moves = []
+        if in_palace(side, row, col):
+            for dr, dc in ((-1, -1), (-1, 1), (1, -1), (1, 1)):
+                if in_palace(side, row + dr, col + dc):
+                    moves.append(square(row + dr, col + dc))
+        table.append(tuple(moves))
+    return table
+
+
+def _build_elephant_moves(side):
+    """Tượng: 2 ô chéo, không qua sông, kèm ô "mắt tượng" chặn đường"""
+    table = []
+    for sq in range(BOARD_SIZE):
+        row, col = SQUARE_COORDS[sq]
+        moves = []
+        if own_half(side, row):
+            for dr, dc in ((-2, -2), (-2, 2), (2, -2), (2, 2)):
+                to_row, to_col = row + dr, col + dc
+                if on_board(to_row, to_col) and own_half(side, to_row):
+                    eye = square(row + dr // 2, col + dc // 2)
+                    moves.append((square(to_row, to_col), eye))
+        table.append(tuple(moves))
+    return table
+
+
+def _build_horse_moves():
+    """Mã: hình chữ "日", kèm ô "chân mã" chặn đường"""
+    table = []
+    for sq in range(BOARD_SIZE):
+        row, col = SQUARE_COORDS[sq]
+        moves = []
+        for dr, dc, leg_dr, leg_dc in (
+            (-2, -1, -1, 0), (-2, 1, -1, 0),  # Lên 2, trái/phải 1
+            (2, -1, 1, 0), (2, 1, 1, 0),      # Xuống 2, trái/phải 1
+            (-1, -2, 0, -1), (1, -2, 0, -1),  # Trái 2, lên/xuống 1
+            (-1, 2, 0, 1), (1, 2, 0, 1),      # Phải 2, lên/xuống 1
+        ):
+            to_row, to_col = row + dr, col + dc
+            if on_board(to_row, to_col):
+                leg = square(row + leg_dr, col + leg_dc)
+                moves.append((square(to_row, to_col), leg))
+        table.append(tuple(moves))
+    return table
+
+
+def _build_soldier_moves(side):
+    """Tốt: tiến 1 ô, sau khi qua sông được đi ngang 1 ô"""
+    forward = -1 if side == RED else 1
+    table = []
+    for sq in range(BOARD_SIZE):
+        row, col = SQUARE_COORDS[sq]
+        moves = []
+        if on_board(row + forward, col):
+            moves.append(square(row + forward, col))
+        if not own_half(side, row):
+            for dc in (-1, 1):
+                if on_board(row, col + dc):
+                    moves.append(square(row, col + dc))
+        table.append(tuple(moves))
+    return table
+
+
+# Ô đích của từng quân theo ô xuất phát (và theo màu nếu luật phụ thuộc màu)
+GENERAL_MOVES = {RED: _build_general_moves(RED), BLACK: _build_general_moves(BLACK)}
+ADVISOR_MOVES = {RED: _build_advisor_moves(RED), BLACK: _build_advisor_moves(BLACK)}
+SOLDIER_MOVES = {RED: _build_soldier_moves(RED), BLACK: _build_soldier_moves(BLACK)}
+
+# Các bảng có ô chặn: mỗi phần tử là (ô đích, ô chặn)
+ELEPHANT_MOVES = {RED: _build_elephant_moves(RED), BLACK: _build_elephant_moves(BLACK)}
+HORSE_MOVES = _build_horse_moves()
+
+
+def _build_horse_attacks():
+    """Mã tấn công một ô: (ô đứng của Mã, ô "chân mã" của Mã đó), đảo ngược từ HORSE_MOVES"""
+    table = [[] for _ in range(BOARD_SIZE)]
+    for sq in range(BOARD_SIZE):
+        for to, leg in HORSE_MOVES[sq]:
+            table[to].append((sq, leg))
+    return [tuple(moves) for moves in table]
+
+
+def _build_soldier_attacks(side):
+    """Tốt tấn công một ô: các ô mà Tốt đứng đó đi được tới ô này"""
+    table = [[] for _ in range(BOARD_SIZE)]
+    for sq in range(BOARD_SIZE):
+        for to in SOLDIER_MOVES[side][sq]:
+            table[to].append(sq)
+    return [tuple(moves) for moves in table]
+
+
+# Bảng ngược: các ô mà từ đó quân cờ tấn công được một ô cho trước.
+# Tướng, Sĩ, Tượng đi đối xứng nên dùng luôn bảng nước đi của chúng.
+HORSE_ATTACKS = _build_horse_attacks()
+SOLDIER_ATTACKS = {RED: _build_soldier_attacks(RED), BLACK: _build_soldier_attacks(BLACK)}
+
+
+def _build_slides(length):
+    """
+    Bảng trượt cho một hàng/cột dài `length` ô.
+
+    Với mỗi vị trí i và mỗi mẫu chiếm chỗ `bits` (bit j bật nếu ô j có quân),
+    lưu bộ (lo1, hi1, lo2, hi2): quân chặn gần nhất và quân thứ hai về hai
+    phía của i. Dùng -1 và `length` khi không có quân. Các ô trống giữa hai
+    quân chặn gần nhất là nước đi thường, quân chặn gần nhất là mục tiêu ăn
+    của Xe, quân thứ hai là mục tiêu ăn của Pháo (quân gần nhất làm "ngòi").
+    """
+    table = []
+    for i in range(length):
+        entries = []
+        for bits in range(1 << length):
+            lower = [j for j in range(i - 1, -1, -1) if bits >> j & 1]
+            upper = [j for j in range(i + 1, length) if bits >> j & 1]
+            entries.append((
+                lower[0] if lower else -1,
+                upper[0] if upper else length,
+                lower[1] if len(lower) > 1 else -1,
+                upper[1] if len(upper) > 1 else length,
+            ))
+        table.append(entries)
+    return table
+
+
+# Bảng trượt theo hàng ngang (chỉ số là cột) và theo cột dọc (chỉ số là hàng)
+RANK_SLIDES = _build_slides(BOARD_COLS)
+FILE_SLIDES = _build_slides(BOARD_ROWS)
+
+
+def _build_controls(slides, step):
+    """
+    Bảng ô khống chế của Xe và Pháo trên một hàng/cột, suy ra từ bảng trượt.
+
+    Với mỗi vị trí i và mẫu chiếm chỗ bits, lưu hai bộ độ lệch (chỉ số nhân
+    step) cho Xe và Pháo. Xe khống chế các ô trống cùng quân chặn gần nhất,
+    Pháo khống chế các ô trống trước ngòi và quân thứ hai (kể cả quân mình).
+    """
+    length = len(slides)
+    table = []
+    for i, entries in enumerate(slides):
+        # Nhiều mẫu chiếm chỗ cho cùng bộ quân chặn: tính mỗi bộ một lần
+        cache = {}
+        for entry in entries:
+            if entry not in cache:
+                lo, hi, lo2, hi2 = entry
+                chariot = list(range(max(lo, 0), i)) + list(range(i + 1, min(hi + 1, length)))
+                cannon = list(range(lo + 1, i)) + list(range(i + 1, hi))
+                cannon += [j for j in (lo2, hi2) if 0 <= j < length]
+                cache[entry] = (tuple(j * step for j in chariot), tuple(j * step for j in cannon))
+        table.append([cache[entry] for entry in entries])
+    return table
+
+
+# Bảng ô khống chế theo hàng (độ lệch cột) và theo cột (độ lệch hàng * BOARD_COLS),
+# phần tử là (Xe, Pháo); dùng cho movegen.attack_map
+RANK_CONTROLS = _build_controls(RANK_SLIDES, 1)
+FILE_CONTROLS = _build_controls(FILE_SLIDES, BOARD_COLS)
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Biểu diễn thế cờ gọn cho AI, không phụ thuộc vào các đối tượng Piece và QColor.
+
+Mỗi ô lưu một mã quân kiểu số nguyên nhỏ (xem movetables.py): mã dương là
+quân đỏ, mã âm là quân đen, 0 là ô trống. Nhờ vậy kiểm tra màu quân chỉ là
+so sánh dấu và sao chép thế cờ chỉ là sao chép một mảng 90 byte.
+"""
+
+import random
+from array import array
+from bisect import insort
+
+from .movetables import (
+    RED, BLACK, GENERAL, ADVISOR, ELEPHANT, HORSE, CHARIOT, CANNON, SOLDIER,
+    BOARD_ROWS, BOARD_COLS, BOARD_SIZE, PIECE_NAMES, PIECE_TYPES, SQUARE_COORDS, square,
+)
+from .pst import pst_score
+
+# Khóa Zobrist 64 bit: một khóa cho mỗi cặp (mã quân, ô), chỉ số là mã quân + 7,
+# và một khóa được XOR vào khi đến lượt quân đen. Dùng seed cố định để khóa
+# không đổi giữa các lần chạy.
+_zobrist_random = random.Random(0x5EED)
+ZOBRIST_PIECES = [[_zobrist_random.getrandbits(64) for _ in range(BOARD_SIZE)]
+                  for _ in range(15)]
+ZOBRIST_SIDE = _zobrist_random.getrandbits(64)
+
+# Ký hiệu quân trong FEN (chữ hoa là quân đỏ, chữ thường là quân đen); khi
+# đọc FEN chấp nhận thêm ký hiệu cũ E (Tượng) và H (Mã)
+FEN_LETTERS = {GENERAL: 'K', ADVISOR: 'A', ELEPHANT: 'B', HORSE: 'N', CHARIOT: 'R',
+               CANNON: 'C', SOLDIER: 'P'}
+FEN_CODES = dict({letter: code for code, letter in FEN_LETTERS.items()},
+                 E=ELEPHANT, H=HORSE)
+
+# Thế cờ ban đầu
+START_FEN = "rnbakabnr/9/1c5c1/p1p1p1p1p/9/9/P1P1P1P1P/1C5C1/9/RNBAKABNR w - - 0 1"
+
+
+def side_of(color):
+    """
+    Chuyển màu của giao diện hoặc của các engine cũ thành RED/BLACK
+
+    Args:
+        color: QColor, 'r'/'b', 'red'/'black' hoặc RED/BLACK
+
+    Returns:
+        int: RED hoặc BLACK
+    """
+    if hasattr(color, 'red'):
+        return RED if color.red() > 0 else BLACK
+    if color in (RED, 'r', 'red'):
+        return RED
+    return BLACK
+
+
+class Position:
+    """Thế cờ: 90 ô chứa mã quân cùng bên đến lượt đi"""
+
+    __slots__ = ('squares', 'side', 'ranks', 'files', 'pieces', 'generals', 'pst', 'score',
+                 'key', 'history')
+
+    def __init__(self, squares=None, side=RED):
+        """
+        Khởi tạo thế cờ
+
+        Args:
+            squares: Dãy 90 mã quân (mặc định là bàn cờ trống)
+            side: Bên đến lượt đi (RED hoặc BLACK)
+        """
+        self.squares = array('b', squares if squares is not None else bytes(BOARD_SIZE))
+        self.side = side
+
+        # Chỉ mục chiếm chỗ theo hàng/cột dùng cho bảng trượt của Xe, Pháo
+        self.ranks = [0] * BOARD_ROWS
+        self.files = [0] * BOARD_COLS
+
+        # Danh sách ô của từng loại quân mỗi bên, chỉ số là mã quân + 7 (giống
+        # ZOBRIST_PIECES); mỗi danh sách luôn được giữ tăng dần theo ô
+        self.pieces = [[] for _ in range(15)]
+        for sq in range(BOARD_SIZE):
+            piece = self.squares[sq]
+            if piece:
+                row, col = SQUARE_COORDS[sq]
+                self.ranks[row] |= 1 << col
+                self.files[col] |= 1 << row
+                self.pieces[piece + 7].append(sq)
+
+        # Vị trí Tướng của hai bên, chỉ số là mã quân Tướng (generals[RED], generals[BLACK]);
+        # -1 nếu Tướng đã bị ăn
+        self.generals = [-1, -1, -1]
+        for side in (RED, BLACK):
+            if GENERAL * side in self.squares:
+                self.generals[side] = self.squares.index(GENERAL * side)
+
+        # Bảng giá trị quân + vị trí của engine (xem pst.py) và tổng điểm đỏ trừ
+        # đen được cập nhật tăng dần; chưa gắn bảng thì không cập nhật
+        self.pst = None
+        self.score = 0
+
+        self.key = self.compute_key()
+
+        # Ngăn xếp hoàn tác: mỗi phần tử là (nước đi, mã quân bị ăn, khóa trước nước đi)
+        self.history = []
+
+    @classmethod
+    def from_board(cls, board, side=RED):
+        """
+        Tạo thế cờ từ bàn cờ 10x9 của giao diện (list hoặc mảng numpy chứa Piece)
+
+        Args:
+            board: Bàn cờ chứa các đối tượng Piece, ô trống là 0
+            side: Bên đến lượt đi (nhận mọi dạng màu mà side_of() hiểu)
+        """
+        codes = array('b', bytes(BOARD_SIZE))
+        for row in range(BOARD_ROWS):
+            for col in range(BOARD_COLS):
+                piece = board[row][col]
+                if piece != 0 and piece != ' ':
+                    code = PIECE_TYPES[piece.__class__.__name__]
+                    codes[square(row, col)] = code * side_of(piece.color)
+        return cls(codes, side_of(side))
+
+    @classmethod
+    def from_fen(cls, fen):
+        """
+        Tạo thế cờ từ chuỗi FEN (hàng đầu tiên là hàng 0 phía quân đen)
+
+        Args:
+            fen: Chuỗi FEN, ví dụ START_FEN; các trường sau bên đến lượt bị bỏ qua
+
+        Returns:
+            Position: Thế cờ tương ứng
+
+        Raises:
+            ValueError: Nếu chuỗi FEN không hợp lệ
+        """
+        fields = fen.split()
+        rows = fields[0].split('/') if fields else []
+        if len(rows) != BOARD_ROWS:
+            raise ValueError("FEN phải có %d hàng: %r" % (BOARD_ROWS, fen))
+        codes = array('b', bytes(BOARD_SIZE))
+        for row, text in enumerate(rows):
+            col = 0
+            for char in text:
+                if char.isdigit():
+                    col += int(char)
+                elif char.upper() in FEN_CODES and col < BOARD_COLS:
+                    code = FEN_CODES[char.upper()]
+                    codes[square(row, col)] = code if char.isupper() else -code
+                    col += 1
+                else:
+                    raise ValueError("Ký hiệu không hợp lệ %r trong FEN: %r" % (char, fen))
+            if col != BOARD_COLS:
+                raise ValueError("Hàng %d của FEN không đủ %d cột: %r" % (row, BOARD_COLS, fen))
+        side = BLACK if len(fields) > 1 and fields[1] == 'b' else RED
+        return cls(codes, side)
+
+    def to_fen(self):
+        """Chuyển thế cờ thành chuỗi FEN"""
+        rows = []
+        for row in range(BOARD_ROWS):
+            text = ''
+            empty = 0
+            for col in range(BOARD_COLS):
+                piece = self.squares[square(row, col)]
+                if not piece:
+                    empty += 1
+                    continue
+                if empty:
+                    text += str(empty)
+                    empty = 0
+                letter = FEN_LETTERS[abs(piece)]
+                text += letter if piece > 0 else letter.lower()
+            if empty:
+                text += str(empty)
+            rows.append(text)
+        return "%s %s - - 0 1" % ('/'.join(rows), 'w' if self.side == RED else 'b')
+
+    def to_board(self, piece_classes, red, black):
+        """
+        Tạo bàn cờ 10x9 của giao diện từ thế cờ
+
+        Args:
+            piece_classes: Từ điển tên lớp quân cờ -> lớp (xem pieces.PIECE_CLASSES)
+            red, black: Đối tượng màu của giao diện cho hai bên
+
+        Returns:
+            list: Bàn cờ 10x9 chứa các đối tượng Piece, ô trống là 0
+        """
+        board = [[0] * BOARD_COLS for _ in range(BOARD_ROWS)]
+        for sq in range(BOARD_SIZE):
+            piece = self.squares[sq]
+            if piece:
+                row, col = SQUARE_COORDS[sq]
+                piece_class = piece_classes[PIECE_NAMES[abs(piece)]]
+                board[row][col] = piece_class(red if piece > 0 else black, (row, col))
+        return board
+
+    def copy(self):
+        """Tạo bản sao của thế cờ"""
+        position = Position.__new__(Position)
+        position.squares = self.squares[:]
+        position.side = self.side
+        position.ranks = self.ranks[:]
+        position.files = self.files[:]
+        position.pieces = [squares[:] for squares in self.pieces]
+        position.generals = self.generals[:]
+        position.pst = self.pst
+        position.score = self.score
+        position.key = self.key
+        position.history = self.history[:]
+        return position
+
+    def __eq__(self, other):
+        if not isinstance(other, Position):
+            return NotImplemented
+        return self.side == other.side and self.squares == other.squares
+
+    __hash__ = None
+
+    def piece_squares(self, side):
+        """
+        Liệt kê các quân của một bên theo danh sách quân (không duyệt cả 90 ô)
+
+        Returns:
+            list: Các cặp (mã quân, ô), theo loại quân rồi theo ô
+        """
+        pieces = self.pieces
+        return [(code * side, sq)
+                for code in range(GENERAL, SOLDIER + 1)
+                for sq in pieces[code * side + 7]]
+
+    def set_pst(self, table):
+        """
+        Gắn bảng giá trị quân + vị trí (xem pst.build_pst) và tính lại tổng điểm
+
+        Sau đó make_move/unmake_move giữ position.score (đỏ trừ đen) bằng hiệu
+        các phần tử của bảng thay vì tính lại ở mỗi lá.
+        """
+        self.pst = table
+        self.score = pst_score(self, table) if table is not None else 0
+
+    def compute_key(self):
+        """Tính khóa Zobrist của thế cờ từ đầu (chỉ dùng khi khởi tạo hoặc kiểm tra)"""
+        key = ZOBRIST_SIDE if self.side == BLACK else 0
+        for sq in range(BOARD_SIZE):
+            piece = self.squares[sq]
+            if piece:
+                key ^= ZOBRIST_PIECES[piece + 7][sq]
+        return key
+
+    def set_side(self, side):
+        """Đặt bên đến lượt đi và cập nhật khóa Zobrist"""
+        if side != self.side:
+            self.side = side
+            self.key ^= ZOBRIST_SIDE
+
+    def is_repetition(self):
+        """
+        Kiểm tra thế cờ hiện tại (cùng bên đến lượt) đã xuất hiện trong lịch sử chưa
+
+        Chỉ cần xét ngược đến nước ăn quân gần nhất vì các thế cờ trước đó
+        có nhiều quân hơn nên không thể trùng. Nước bỏ lượt cũng chặn việc
+        so sánh vì lặp lại qua nước bỏ lượt không phải lặp lại thật.
+        """
+        history = self.history
+        key = self.key
+        for i in range(len(history) - 2, -1, -2):
+            if history[i][2] == key:
+                return True
+            move, captured = history[i][:2]
+            next_move, next_captured = history[i + 1][:2]
+            if captured or next_captured or not move or not next_move:
+                break
+        return False
+
+    def make_move(self, move):
+        """
+        Thực hiện nước đi ngay trên thế cờ, chuyển lượt và ghi vào ngăn xếp hoàn tác
+
+        Args:
+            move: Nước đi dạng số nguyên (xem movetables.encode_move)
+
+        Returns:
+            int: Mã quân bị ăn (0 nếu không ăn quân)
+        """
+        src = move >> 7
+        dst = move & 127
+        squares = self.squares
+        piece = squares[src]
+        captured = squares[dst]
+        squares[dst] = piece
+        squares[src] = 0
+        self.history.append((move, captured, self.key))
+
+        # Cập nhật khóa Zobrist: bỏ quân ở ô đi, thêm ở ô đến, bỏ quân bị ăn, đổi lượt
+        key = self.key ^ ZOBRIST_PIECES[piece + 7][src] ^ ZOBRIST_PIECES[piece + 7][dst] ^ ZOBRIST_SIDE
+        if captured:
+            key ^= ZOBRIST_PIECES[captured + 7][dst]
+        self.key = key
+
+        # Cập nhật chỉ mục chiếm chỗ
+        src_row, src_col = SQUARE_COORDS[src]
+        self.ranks[src_row] ^= 1 << src_col
+        self.files[src_col] ^= 1 << src_row
+        if not captured:
+            dst_row, dst_col = SQUARE_COORDS[dst]
+            self.ranks[dst_row] |= 1 << dst_col
+            self.files[dst_col] |= 1 << dst_row
+
+        # Cập nhật danh sách quân
+        moved = self.pieces[piece + 7]
+        moved.remove(src)
+        insort(moved, dst)
+        if captured:
+            self.pieces[captured + 7].remove(dst)
+
+        # Cập nhật điểm vật chất + vị trí
+        pst = self.pst
+        if pst is not None:
+            values = pst[piece + 7]
+            self.score += values[dst] - values[src]
+            if captured:
+                self.score -= pst[captured + 7][dst]
+
+        # Cập nhật vị trí Tướng
+        if piece == GENERAL or piece == -GENERAL:
+            self.generals[piece] = dst
+        if captured == GENERAL or captured == -GENERAL:
+            self.generals[captured] = -1
+
+        self.side = -self.side
+        return captured
+
+    def make_null_move(self):
+        """
+        Bỏ lượt (nước đi rỗng) dùng cho cắt tỉa nước rỗng: chỉ đổi bên đi và khóa Zobrist
+
+        Nước rỗng được ghi vào ngăn xếp hoàn tác với mã nước đi 0 và được
+        hoàn tác bằng unmake_move như nước đi thường.
+        """
+        self.history.append((0, 0, self.key))
+        self.key ^= ZOBRIST_SIDE
+        self.side = -self.side
+
+    def unmake_move(self):
+        """
+        Hoàn tác nước đi (hoặc nước bỏ lượt) cuối cùng
+
+        Returns:
+            int: Nước đi vừa được hoàn tác (0 nếu là nước bỏ lượt)
+        """
+        move, captured, self.key = self.history.pop()
+        if not move:
+            self.side = -self.side
+            return move
+        src = move >> 7
+        dst = move & 127
+        squares = self.squares
+        piece = squares[dst]
+        squares[src] = piece
+        squares[dst] = captured
+        moved = self.pieces[piece + 7]
+        moved.remove(dst)
+        insort(moved, src)
+        if captured:
+            insort(self.pieces[captured + 7], dst)
+        pst = self.pst
+        if pst is not None:
+            values = pst[piece + 7]
+            self.score += values[src] - values[dst]
+            if captured:
+                self.score += pst[captured + 7][dst]
+        if piece == GENERAL or piece == -GENERAL:
+            self.generals[piece] = src
+        if captured == GENERAL or captured == -GENERAL:
+            self.generals[captured] = dst
+
+        # Khôi phục chỉ mục chiếm chỗ
+        src_row, src_col = SQUARE_COORDS[src]
+        self.ranks[src_row] |= 1 << src_col
+        self.files[src_col] |= 1 << src_row
+        if not captured:
+            dst_row, dst_col = SQUARE_COORDS[dst]
+            self.ranks[dst_row] ^= 1 << dst_col
+            self.files[dst_col] ^= 1 << dst_row
+
+        self.side = -self.side
+        return move
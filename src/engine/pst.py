@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Bảng giá trị quân + vị trí (piece-square table) phẳng 90 ô cho đánh giá tăng dần.
+
+Mỗi engine có bảng giá trị quân và bảng vị trí 10x9 riêng (nhìn từ phía quân
+đỏ). build_pst() gộp hai bảng đó thành 15 bảng phẳng, chỉ số là mã quân + 7
+(giống ZOBRIST_PIECES): giá trị của quân đen đã được lật hàng và đổi dấu. Nhờ
+vậy Position chỉ cần cộng/trừ vài phần tử khi đi/hoàn tác nước đi để giữ tổng
+điểm vật chất + vị trí (đỏ trừ đen), không phải tính lại ở mỗi lá.
+"""
+
+from .movetables import RED, BLACK, SOLDIER, BOARD_ROWS, BOARD_SIZE, PIECE_NAMES, SQUARE_COORDS
+
+
+def build_pst(piece_values, position_values, position_scale=1):
+    """
+    Tạo bảng giá trị quân + vị trí phẳng theo mã quân
+
+    Args:
+        piece_values: Từ điển tên quân -> giá trị (khóa "AdvancedSoldier" nếu
+                      Tốt qua sông có giá trị riêng)
+        position_values: Từ điển tên quân -> bảng 10x9 nhìn từ phía quân đỏ
+        position_scale: Hệ số nhân cho giá trị vị trí
+
+    Returns:
+        list: 15 bảng 90 phần tử, chỉ số là mã quân + 7; giá trị dương cho quân
+              đỏ, âm cho quân đen
+    """
+    table = [[0] * BOARD_SIZE for _ in range(15)]
+    for code, name in PIECE_NAMES.items():
+        for side in (RED, BLACK):
+            values = table[code * side + 7]
+            for sq in range(BOARD_SIZE):
+                row, col = SQUARE_COORDS[sq]
+                # Hàng nhìn từ phía bên mình: quân đen lật bảng
+                own_row = row if side == RED else BOARD_ROWS - 1 - row
+                value = piece_values.get(name, 0)
+                if code == SOLDIER and own_row < 5 and "AdvancedSoldier" in piece_values:
+                    value = piece_values["AdvancedSoldier"]  # Tốt đã qua sông
+                if name in position_values:
+                    value += position_values[name][own_row][col] * position_scale
+                values[sq] = value * side
+    return table
+
+
+def pst_score(position, table):
+    """
+    Tính tổng điểm vật chất + vị trí (đỏ trừ đen) từ đầu theo danh sách quân
+
+    Returns:
+        int: Tổng điểm theo góc nhìn của quân đỏ
+    """
+    score = 0
+    for index, squares in enumerate(position.pieces):
+        values = table[index]
+        for sq in squares:
+            score += values[sq]
+    return score
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Bảng chuyển vị (transposition table) có kích thước cố định cho AI.
+
+Dữ liệu được lưu trong các mảng song song cấp phát sẵn thay vì dict, nên bộ
+nhớ không tăng theo số thế cờ đã duyệt. Bảng chia thành các "bucket" gồm 2 ô:
+ô đầu ưu tiên giữ kết quả tìm kiếm sâu hơn, ô sau luôn bị ghi đè. Mỗi lượt
+tìm kiếm tăng "tuổi" của bảng để các mục cũ được thay thế trước.
+"""
+
+from array import array
+
+# Loại giá trị được lưu
+EXACT = 0        # Giá trị chính xác
+LOWER_BOUND = 1  # Giới hạn dưới (cắt tỉa beta)
+UPPER_BOUND = 2  # Giới hạn trên (không nước nào vượt alpha)
+
+# Số byte cho một mục: khóa 8, giá trị 4, nước đi 2, độ sâu 1, loại 1, tuổi 1
+ENTRY_BYTES = 17
+BUCKET_SIZE = 2
+
+
+class TranspositionTable:
+    """Bảng chuyển vị giới hạn theo MB, có chính sách thay thế và thống kê"""
+
+    def __init__(self, size_mb=16):
+        """
+        Khởi tạo bảng chuyển vị
+
+        Args:
+            size_mb: Dung lượng tối đa của bảng (MB)
+        """
+        self.resize(size_mb)
+
+    def resize(self, size_mb):
+        """
+        Cấp phát lại bảng với dung lượng mới (xóa toàn bộ dữ liệu)
+
+        Số bucket được làm tròn xuống lũy thừa của 2 để lấy chỉ số bằng phép AND.
+        """
+        buckets = max(1, int(size_mb * 1024 * 1024) // (ENTRY_BYTES * BUCKET_SIZE))
+        buckets = 1 << (buckets.bit_length() - 1)
+        self.size_mb = size_mb
+        self.mask = buckets - 1
+        self.clear()
+
+    def clear(self):
+        """Xóa toàn bộ các mục và thống kê"""
+        entries = (self.mask + 1) * BUCKET_SIZE
+        self.keys = array('Q', bytes(8 * entries))
+        self.values = array('i', bytes(4 * entries))
+        self.moves = array('H', bytes(2 * entries))
+        self.depths = array('b', bytes(entries))
+        self.flags = array('B', bytes(entries))
+        self.ages = array('B', bytes(entries))  # 0 nghĩa là ô trống
+        self.age = 1
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Đặt lại các bộ đếm thống kê"""
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.collisions = 0
+
+    def new_search(self):
+        """Tăng tuổi của bảng khi bắt đầu một lượt tìm kiếm mới"""
+        self.age = self.age % 255 + 1
+
+    def probe(self, key):
+        """
+        Tìm mục ứng với khóa Zobrist
+
+        Returns:
+            tuple: (value, depth, flag, move) hoặc None nếu không có
+        """
+        self.probes += 1
+        index = (key & self.mask) * BUCKET_SIZE
+        keys = self.keys
+        for slot in (index, index + 1):
+            if keys[slot] == key and self.ages[slot]:
+                self.hits += 1
+                self.ages[slot] = self.age  # Mục còn dùng được thì làm mới tuổi
+                return self.values[slot], self.depths[slot], self.flags[slot], self.moves[slot]
+        return None
+
+    def store(self, key, depth, value, flag, move=0):
+        """
+        Lưu kết quả tìm kiếm của một thế cờ
+
+        Ô ưu tiên độ sâu bị thay thế khi cùng khóa, khi mục mới sâu hơn hoặc
+        bằng, hoặc khi mục cũ thuộc lượt tìm kiếm trước; mục bị đẩy ra được
+        chuyển xuống ô luôn ghi đè. Các trường hợp còn lại ghi vào ô luôn ghi đè.
+
+        Args:
+            key: Khóa Zobrist của thế cờ
+            depth: Độ sâu còn lại khi tìm kiếm
+            value: Giá trị tìm được
+            flag: EXACT, LOWER_BOUND hoặc UPPER_BOUND
+            move: Nước đi tốt nhất (0 nếu không có)
+        """
+        self.stores += 1
+        keys = self.keys
+        ages = self.ages
+        deep = (key & self.mask) * BUCKET_SIZE
+        slot = deep + 1
+
+        if keys[deep] == key or not ages[deep] or depth >= self.depths[deep] or ages[deep] != self.age:
+            if keys[deep] != key and ages[deep]:
+                # Chuyển mục cũ xuống ô luôn ghi đè
+                self._copy(deep, slot)
+            slot = deep
+
+        if ages[slot] and keys[slot] != key:
+            self.collisions += 1
+        elif ages[slot] and not move:
+            move = self.moves[slot]  # Giữ lại nước đi tốt nhất đã biết
+
+        keys[slot] = key
+        self.values[slot] = value
+        self.moves[slot] = move
+        self.depths[slot] = depth
+        self.flags[slot] = flag
+        ages[slot] = self.age
+
+    def _copy(self, src, dst):
+        """Sao chép một mục sang ô khác trong bảng"""
+        self.keys[dst] = self.keys[src]
+        self.values[dst] = self.values[src]
+        self.moves[dst] = self.moves[src]
+        self.depths[dst] = self.depths[src]
+        self.flags[dst] = self.flags[src]
+        self.ages[dst] = self.ages[src]
+
+    def stats(self):
+        """
+        Thống kê sử dụng bảng để chọn kích thước phù hợp
+
+        Returns:
+            dict: Số lần tra, trúng, lưu, đụng độ cùng các tỷ lệ tương ứng
+        """
+        return {
+            'size_mb': self.size_mb,
+            'entries': len(self.keys),
+            'probes': self.probes,
+            'hits': self.hits,
+            'stores': self.stores,
+            'collisions': self.collisions,
+            'hit_rate': self.hits / self.probes if self.probes else 0.0,
+            'collision_rate': self.collisions / self.stores if self.stores else 0.0,
+        }
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Giao thức UCCI (Universal Chinese Chess Interface) qua stdin/stdout.
+
+Cho phép dùng engine (ai_advanced.ChineseChessAI) trong các chương trình quản
+lý giải đấu và công cụ chạy hàng loạt, không cần giao diện PyQt5:
+
+    cd src && python -m engine
+
+Các lệnh được hỗ trợ: ucci, isready, setoption (hashsize, threads, newgame),
+position {fen <FEN> | startpos} [moves <nước đi> ...], go [depth <d> | nodes <n> |
+time <ms> [movestogo <n> | increment <ms>] | movetime <ms> | infinite], stop, quit.
+Việc tìm kiếm chạy ở luồng riêng để vẫn đọc được lệnh stop; sau mỗi độ sâu
+engine in một dòng "info depth ... score ... time ... nodes ... nps ... pv ...".
+
+Nước đi được ghi theo tọa độ UCCI: cột a-i từ trái sang phải, hàng 0-9 từ phía
+quân đỏ lên phía quân đen, ví dụ "h2e2" là Pháo đỏ bình trung.
+"""
+
+import sys
+import threading
+import time
+
+from .movetables import BOARD_ROWS, BOARD_COLS, SQUARE_COORDS, encode_move, square
+from .movegen import generate_legal_moves
+from .position import Position, START_FEN
+from .ai_advanced import ChineseChessAI
+
+ENGINE_NAME = "Chinachess"
+ENGINE_AUTHOR = "Chinachess"
+
+# Dung lượng bảng chuyển vị (MB)
+DEFAULT_HASH_MB = 16
+MIN_HASH_MB = 1
+MAX_HASH_MB = 1024
+
+# Tìm kiếm viết bằng Python chạy trên một luồng (GIL), tùy chọn threads chỉ nhận 1
+MAX_THREADS = 1
+
+# Độ sâu tối đa khi lệnh go không giới hạn độ sâu
+MAX_DEPTH = 32
+
+# Phân bổ thời gian khi chỉ biết thời gian còn lại trên đồng hồ
+DEFAULT_MOVES_TO_GO = 30   # Số nước giả định còn phải đi
+TIME_SAFETY_MS = 50        # Thời gian chừa lại cho việc truyền lệnh
+
+
+def move_to_ucci(move):
+    """Chuyển nước đi dạng số nguyên thành chuỗi UCCI, ví dụ "h2e2" """
+    text = ''
+    for sq in (move >> 7, move & 127):
+        row, col = SQUARE_COORDS[sq]
+        text += 'abcdefghi'[col] + str(BOARD_ROWS - 1 - row)
+    return text
+
+
+def ucci_to_move(text):
+    """
+    Chuyển chuỗi UCCI (ví dụ "h2e2") thành nước đi dạng số nguyên
+
+    Raises:
+        ValueError: Nếu chuỗi không phải tọa độ hợp lệ
+    """
+    if len(text) != 4:
+        raise ValueError("Nước đi UCCI không hợp lệ: %r" % text)
+    squares = []
+    for file_char, rank_char in (text[0:2], text[2:4]):
+        col = ord(file_char) - ord('a')
+        if not (0 <= col < BOARD_COLS and rank_char.isdigit()):
+            raise ValueError("Nước đi UCCI không hợp lệ: %r" % text)
+        squares.append(square(BOARD_ROWS - 1 - int(rank_char), col))
+    return encode_move(*squares)
+
+
+class UCCIEngine:
+    """Vòng lặp lệnh UCCI quanh một đối tượng ChineseChessAI"""
+
+    def __init__(self, output=None):
+        """
+        Args:
+            output: Luồng ghi phản hồi (mặc định là sys.stdout)
+        """
+        self.output = output if output is not None else sys.stdout
+        self.output_lock = threading.Lock()
+        self.ai = ChineseChessAI('expert', hash_mb=DEFAULT_HASH_MB)
+        self.threads = 1
+        self.position = Position.from_fen(START_FEN)
+
+        # Luồng tìm kiếm đang chạy, cờ báo đã nhận lệnh stop
+        self.search_thread = None
+        self.stop_event = threading.Event()
+
+    def send(self, line):
+        """Ghi một dòng phản hồi (an toàn khi gọi từ luồng tìm kiếm)"""
+        with self.output_lock:
+            self.output.write(line + "\n")
+            self.output.flush()
+
+    def run(self, stream=None):
+        """
+        Đọc và xử lý lệnh đến khi gặp quit hoặc hết dữ liệu vào
+
+        Args:
+            stream: Luồng đọc lệnh (mặc định là sys.stdin)
+        """
+        stream = stream if stream is not None else sys.stdin
+        for line in stream:
+            if not self.handle(line):
+                break
+        self.wait()
+
+    def handle(self, line):
+        """
+        Xử lý một dòng lệnh
+
+        Returns:
+            bool: False nếu là lệnh quit
+        """
+        tokens = line.split()
+        if not tokens:
+            return True
+        command, args = tokens[0], tokens[1:]
+        if command == 'quit':
+            self.stop()
+            self.wait()
+            self.send("bye")
+            return False
+        handler = getattr(self, 'cmd_' + command, None)
+        if handler is None:
+            self.send("info string unknown command %s" % command)
+            return True
+        try:
+            handler(args)
+        except ValueError as error:
+            self.send("info string %s" % error)
+        return True
+
+    def cmd_ucci(self, args):
+        """Giới thiệu engine và các tùy chọn"""
+        self.send("id name %s" % ENGINE_NAME)
+        self.send("id author %s" % ENGINE_AUTHOR)
+        self.send("option hashsize type spin min %d max %d default %d"
+                  % (MIN_HASH_MB, MAX_HASH_MB, DEFAULT_HASH_MB))
+        self.send("option threads type spin min 1 max %d default 1" % MAX_THREADS)
+        self.send("option newgame type button")
+        self.send("ucciok")
+
+    def cmd_isready(self, args):
+        self.send("readyok")
+
+    def cmd_setoption(self, args):
+        """
+        Đặt tùy chọn theo cú pháp UCCI ("setoption hashsize 64") hoặc
+        UCI ("setoption name Hash value 64")
+        """
+        if args and args[0] == 'name':
+            args = [token for token in args[1:] if token != 'value']
+        if not args:
+            return
+        name = args[0].lower()
+        value = args[1] if len(args) > 1 else None
+        self.finish()
+        if name in ('hashsize', 'hash'):
+            size_mb = min(max(int(value), MIN_HASH_MB), MAX_HASH_MB)
+            self.ai.transposition_table.resize(size_mb)
+        elif name == 'threads':
+            self.threads = min(max(int(value), 1), MAX_THREADS)
+        elif name == 'newgame':
+            self.new_game()
+        else:
+            self.send("info string unknown option %s" % args[0])
+
+    def cmd_ucinewgame(self, args):
+        self.finish()
+        self.new_game()
+
+    def new_game(self):
+        """Xóa bảng chuyển vị và thông tin sắp xếp nước đi của ván trước"""
+        self.ai.transposition_table.clear()
+        self.ai.history = [0] * len(self.ai.history)
+        self.ai.counter_moves = [0] * len(self.ai.counter_moves)
+
+    def cmd_position(self, args):
+        """position {fen <FEN> | startpos} [moves <nước đi> ...]"""
+        if 'moves' in args:
+            index = args.index('moves')
+            setup, moves = args[:index], args[index + 1:]
+        else:
+            setup, moves = args, []
+        if setup and setup[0] == 'fen':
+            position = Position.from_fen(' '.join(setup[1:]))
+        elif setup and setup[0] == 'startpos':
+            position = Position.from_fen(START_FEN)
+        else:
+            raise ValueError("position cần fen hoặc startpos")
+        for text in moves:
+            move = ucci_to_move(text)
+            if move not in generate_legal_moves(position):
+                raise ValueError("nước đi không hợp lệ %s" % text)
+            position.make_move(move)
+        # Luồng tìm kiếm dùng bản sao nên không cần chờ nó kết thúc
+        self.position = position
+
+    def cmd_go(self, args):
+        """go [depth <d> | nodes <n> | time <ms> ... | movetime <ms> | infinite]"""
+        options = {}
+        infinite = False
+        tokens = iter(args)
+        for token in tokens:
+            if token == 'infinite':
+                infinite = True
+            elif token in ('depth', 'nodes', 'time', 'movetime', 'movestogo', 'increment',
+                           'opptime', 'oppmovestogo', 'oppincrement'):
+                options[token] = int(next(tokens))
+
+        max_depth = min(options.get('depth', MAX_DEPTH), MAX_DEPTH)
+        max_nodes = options.get('nodes', float('inf'))
+        time_limit = float('inf')
+        if 'movetime' in options:
+            time_limit = options['movetime'] / 1000
+        elif 'time' in options:
+            # Chia đều thời gian còn lại cho số nước còn phải đi, cộng thêm phần thưởng mỗi nước
+            moves_to_go = options.get('movestogo', DEFAULT_MOVES_TO_GO)
+            budget = options['time'] / max(moves_to_go, 1) + options.get('increment', 0)
+            budget = min(budget, options['time'] - TIME_SAFETY_MS)
+            time_limit = max(budget, 1) / 1000
+
+        self.finish()
+        self.stop_event.clear()
+        self.search_thread = threading.Thread(
+            target=self._search, args=(self.position.copy(), max_depth, time_limit, max_nodes,
+                                       infinite),
+            daemon=True)
+        self.search_thread.start()
+
+    def cmd_stop(self, args):
+        self.stop()
+
+    def stop(self):
+        """Dừng lượt tìm kiếm đang chạy (nếu có)"""
+        self.stop_event.set()
+        self.ai.stop()
+
+    def wait(self):
+        """Chờ lượt tìm kiếm đang chạy kết thúc"""
+        if self.search_thread is not None:
+            self.search_thread.join()
+            self.search_thread = None
+
+    def finish(self):
+        """
+        Dừng lượt tìm kiếm đang chạy (nếu có) và chờ nó in bestmove trước khi
+        đổi trạng thái engine
+
+        Lượt go không giới hạn (hoặc chỉ giới hạn độ sâu) có thể chạy rất lâu
+        nên phải dừng chứ không chờ chạy hết, nếu không engine sẽ bị treo.
+        """
+        if self.search_thread is not None:
+            self.stop()
+        self.wait()
+
+    def _search(self, position, max_depth, time_limit, max_nodes, infinite):
+        """Thân luồng tìm kiếm: in info sau mỗi độ sâu rồi in bestmove"""
+        start_time = time.time()
+
+        def on_iteration(depth, move, value):
+            # Lệnh stop đến trước khi ai.search() đặt hạn chót thì bị ghi đè, dừng lại ở đây
+            if self.stop_event.is_set():
+                self.ai.stop()
+            if move is None:
+                return
+            elapsed = time.time() - start_time
+            pv = self.ai.principal_variation(position, move, depth)
+            self.send("info depth %d score %d time %d nodes %d nps %d pv %s"
+                      % (depth, value, elapsed * 1000, self.ai.nodes,
+                         self.ai.nodes / elapsed if elapsed > 0 else 0,
+                         ' '.join(move_to_ucci(pv_move) for pv_move in pv)))
+
+        best_move, _ = self.ai.search(position, max_depth, time_limit, max_nodes, on_iteration)
+
+        # Ở chế độ infinite chỉ được trả lời bestmove sau lệnh stop
+        if infinite:
+            self.stop_event.wait()
+        if best_move is None:
+            self.send("nobestmove")
+        else:
+            self.send("bestmove %s" % move_to_ucci(best_move))
+
+
+def main():
+    """Chạy vòng lặp UCCI trên stdin/stdout"""
+    UCCIEngine().run()
+
+
+if __name__ == "__main__":
+    main()
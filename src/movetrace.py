@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Theo dõi (trace) việc kiểm tra nước đi của quân cờ, mặc định tắt.
+
+Mỗi điểm gọi (call site) là một TraceSite có tên dạng "<Lớp>.<phương thức>",
+ví dụ "Horse.is_valid_move" hoặc "General._check_facing_general". Điểm gọi
+phải kiểm tra cờ `enabled` trước khi tạo chuỗi:
+
+    if trace.enabled:
+        trace("Kiểm tra nước đi từ %s đến %s", from_pos, to_pos)
+
+nên khi tắt, đường nóng chỉ tốn một lần đọc thuộc tính, không định dạng chuỗi
+và không ghi ra stdout.
+
+Bật theo loại quân hoặc theo điểm gọi bằng enable("General", "Horse.is_valid_move")
+hoặc biến môi trường CHINACHESS_TRACE="General,Horse.is_valid_move" ("*" là tất cả).
+Chạy `python movetrace.py` để đo chi phí khi tắt/bật.
+"""
+
+import os
+import sys
+from fnmatch import fnmatchcase
+
+# Biến môi trường chứa danh sách mẫu cần bật, cách nhau bởi dấu phẩy
+TRACE_ENV = "CHINACHESS_TRACE"
+
+# Các điểm gọi đã đăng ký: tên -> TraceSite
+_sites = {}
+
+# Các mẫu đang bật (áp dụng cả cho điểm gọi đăng ký sau)
+_patterns = set()
+
+# Luồng ghi trace (None là sys.stdout tại thời điểm ghi)
+_output = None
+
+
+def _matches(name):
+    """Kiểm tra tên điểm gọi có khớp mẫu nào đang bật không"""
+    type_name = name.split(".", 1)[0]
+    for pattern in _patterns:
+        if pattern == type_name or fnmatchcase(name, pattern):
+            return True
+    return False
+
+
+class TraceSite:
+    """Một điểm gọi có thể bật/tắt riêng"""
+
+    __slots__ = ('name', 'enabled', 'count')
+
+    def __init__(self, name):
+        self.name = name
+        self.enabled = _matches(name)
+        self.count = 0  # Số dòng đã ghi
+
+    def __call__(self, message, *args):
+        """
+        Ghi một dòng trace (định dạng kiểu %, chỉ gọi khi enabled)
+
+        Args:
+            message: Chuỗi mẫu
+            args: Tham số cho chuỗi mẫu
+        """
+        self.count += 1
+        output = _output if _output is not None else sys.stdout
+        output.write((message % args if args else message) + "\n")
+
+    def __repr__(self):
+        return "TraceSite(%r, enabled=%r)" % (self.name, self.enabled)
+
+
+def site(name):
+    """
+    Lấy (hoặc đăng ký) điểm gọi theo tên
+
+    Args:
+        name: Tên dạng "<Lớp>.<phương thức>"
+
+    Returns:
+        TraceSite: Điểm gọi dùng chung cho mọi lần gọi
+    """
+    trace_site = _sites.get(name)
+    if trace_site is None:
+        trace_site = _sites[name] = TraceSite(name)
+    return trace_site
+
+
+def _refresh():
+    """Cập nhật cờ enabled của mọi điểm gọi theo các mẫu đang bật"""
+    for trace_site in _sites.values():
+        trace_site.enabled = _matches(trace_site.name)
+
+
+def enable(*patterns):
+    """
+    Bật trace theo loại quân ("General"), điểm gọi ("Horse.is_valid_move")
+    hoặc mẫu glob ("*._check_facing_general", "*")
+    """
+    _patterns.update(patterns)
+    _refresh()
+
+
+def disable(*patterns):
+    """Tắt các mẫu đã bật; không truyền mẫu nào thì tắt toàn bộ"""
+    if patterns:
+        _patterns.difference_update(patterns)
+    else:
+        _patterns.clear()
+    _refresh()
+
+
+def set_output(stream):
+    """Đổi luồng ghi trace (None là sys.stdout)"""
+    global _output
+    _output = stream
+
+
+def sites():
+    """Trả về danh sách các điểm gọi đã đăng ký"""
+    return list(_sites.values())
+
+
+# Bật sẵn theo biến môi trường
+enable(*[pattern.strip() for pattern in os.environ.get(TRACE_ENV, "").split(",") if pattern.strip()])
+
+
+def benchmark(calls=20000):
+    """
+    Đo chi phí is_valid_move khi trace tắt và khi bật (ghi vào luồng rỗng)
+
+    Khi tắt, số dòng được ghi phải là 0: không có chuỗi nào được định dạng.
+
+    Returns:
+        dict: Thời gian mỗi lần gọi (micro giây) và số dòng trace ở mỗi chế độ
+    """
+    import io
+    import time
+    from PyQt5.QtGui import QColor
+    from pieces import General, Advisor, Elephant, Horse, Chariot, Cannon, Soldier
+
+    red, black = QColor(255, 0, 0), QColor(0, 0, 0)
+    board = [[0] * 9 for _ in range(10)]
+    layout = [
+        (General, red, (9, 4)), (General, black, (0, 4)), (Advisor, red, (9, 3)),
+        (Elephant, red, (9, 2)), (Horse, red, (9, 1)), (Chariot, red, (9, 0)),
+        (Cannon, red, (7, 1)), (Soldier, red, (6, 0)), (Horse, black, (0, 1)),
+    ]
+    for piece_class, color, (row, col) in layout:
+        board[row][col] = piece_class(color, (row, col))
+    probes = [
+        ((9, 4), (8, 4)), ((9, 3), (8, 4)), ((9, 2), (7, 4)), ((9, 1), (7, 2)),
+        ((9, 0), (5, 0)), ((7, 1), (0, 1)), ((6, 0), (5, 0)), ((0, 1), (2, 2)),
+    ]
+
+    def run():
+        start = time.perf_counter()
+        for i in range(calls):
+            from_pos, to_pos = probes[i % len(probes)]
+            board[from_pos[0]][from_pos[1]].is_valid_move(board, from_pos, to_pos)
+        return (time.perf_counter() - start) / calls * 1e6
+
+    saved_patterns = set(_patterns)
+    saved_output = _output
+    results = {}
+    try:
+        set_output(io.StringIO())
+        for mode, patterns in (("off", ()), ("on", ("*",))):
+            disable()
+            enable(*patterns)
+            for trace_site in _sites.values():
+                trace_site.count = 0
+            elapsed = run()
+            results[mode] = {
+                "us_per_call": elapsed,
+                "lines": sum(trace_site.count for trace_site in _sites.values()),
+            }
+    finally:
+        disable()
+        enable(*saved_patterns)
+        set_output(saved_output)
+    return results
+
+
+if __name__ == "__main__":
+    # Dùng module đã import (pieces đăng ký điểm gọi vào module movetrace, không phải __main__)
+    import movetrace
+    for mode, result in movetrace.benchmark().items():
+        print("trace %-3s: %.2f us/lần gọi, %d dòng trace" % (mode, result["us_per_call"], result["lines"]))
@@ -3,10 +3,15 @@
 
 import numpy as np
 from PyQt5.QtGui import QColor
+import movetrace
 
 class Piece:
     """Lớp cơ sở cho tất cả các loại quân cờ"""
     
+    # Điểm trace của is_valid_move (xem movetrace.py), mặc định tắt. Mỗi lớp con
+    # có điểm trace riêng nên phần kiểm tra chung ở đây được ghi theo loại quân.
+    trace_site = movetrace.site("Piece.is_valid_move")
+    
     def __init__(self, color, position):
         """
         Khởi tạo quân cờ
@@ -37,16 +42,20 @@ class Piece:
         # Kiểm tra vị trí đích có quân cờ cùng màu không
         to_row, to_col = to_pos
         
-        # In thông tin gỡ lỗi
-        print(f"Kiểm tra nước đi từ {from_pos} đến {to_pos}")
+        # Thông tin gỡ lỗi chỉ được tạo khi trace của loại quân này được bật
+        trace = self.trace_site
+        if trace.enabled:
+            trace("Kiểm tra nước đi từ %s đến %s", from_pos, to_pos)
         
         # Kiểm tra nếu vị trí đích có quân cờ cùng màu
         if board[to_row][to_col] != 0:
             if board[to_row][to_col].color == self.color:
-                print(f"  - Không hợp lệ: Vị trí đích có quân cờ cùng màu")
+                if trace.enabled:
+                    trace("  - Không hợp lệ: Vị trí đích có quân cờ cùng màu")
                 return False
             else:
-                print(f"  - Vị trí đích có quân cờ đối phương: {board[to_row][to_col].get_name()}")
+                if trace.enabled:
+                    trace("  - Vị trí đích có quân cờ đối phương: %s", board[to_row][to_col].get_name())
         
         # Các quân cờ cụ thể sẽ ghi đè phương thức này
         return True  # Đổi từ False sang True để các lớp con có thể kiểm tra tiếp
@@ -55,6 +64,10 @@ class Piece:
 class General(Piece):
     """Quân Tướng/Vua"""
     
+    # Điểm trace của is_valid_move (xem movetrace.py), mặc định tắt
+    trace_site = movetrace.site("General.is_valid_move")
+    facing_trace_site = movetrace.site("General._check_facing_general")
+    
     def get_name(self):
         """Lấy tên hiển thị của quân cờ"""
         return "帅" if self.color.red() > 0 else "将"
@@ -68,18 +81,22 @@ class General(Piece):
         from_row, from_col = from_pos
         to_row, to_col = to_pos
         
-        print(f"Kiểm tra nước đi của Tướng từ ({from_row},{from_col}) đến ({to_row},{to_col})")
+        trace = self.trace_site
+        if trace.enabled:
+            trace("Kiểm tra nước đi của Tướng từ (%s,%s) đến (%s,%s)", from_row, from_col, to_row, to_col)
         
         # Tướng chỉ có thể di chuyển trong cung điện (3x3)
         # Cung điện đỏ: (7-9, 3-5)
         # Cung điện đen: (0-2, 3-5)
         if self.color.red() > 0:  # Tướng đỏ
             if not (7 <= to_row <= 9 and 3 <= to_col <= 5):
-                print(f"  - Không hợp lệ: Tướng đỏ phải ở trong cung điện (7-9, 3-5)")
+                if trace.enabled:
+                    trace("  - Không hợp lệ: Tướng đỏ phải ở trong cung điện (7-9, 3-5)")
                 return False
         else:  # Tướng đen
             if not (0 <= to_row <= 2 and 3 <= to_col <= 5):
-                print(f"  - Không hợp lệ: Tướng đen phải ở trong cung điện (0-2, 3-5)")
+                if trace.enabled:
+                    trace("  - Không hợp lệ: Tướng đen phải ở trong cung điện (0-2, 3-5)")
                 return False
         
         # Tướng chỉ có thể di chuyển 1 ô theo chiều ngang hoặc dọc
@@ -89,20 +106,25 @@ class General(Piece):
         if (row_diff == 1 and col_diff == 0) or (row_diff == 0 and col_diff == 1):
             # Kiểm tra tướng đối phương
             if self._check_facing_general(board, to_pos):
-                print(f"  - Hợp lệ: Tướng di chuyển 1 ô theo chiều ngang hoặc dọc")
+                if trace.enabled:
+                    trace("  - Hợp lệ: Tướng di chuyển 1 ô theo chiều ngang hoặc dọc")
                 return True
             else:
-                print(f"  - Không hợp lệ: Hai tướng không được đối mặt trực tiếp")
+                if trace.enabled:
+                    trace("  - Không hợp lệ: Hai tướng không được đối mặt trực tiếp")
                 return False
         else:
-            print(f"  - Không hợp lệ: Tướng chỉ có thể di chuyển 1 ô theo chiều ngang hoặc dọc")
+            if trace.enabled:
+                trace("  - Không hợp lệ: Tướng chỉ có thể di chuyển 1 ô theo chiều ngang hoặc dọc")
             return False
     
     def _check_facing_general(self, board, new_pos):
         """Kiểm tra hai tướng có đối mặt nhau không"""
         new_row, new_col = new_pos
         
-        print(f"Kiểm tra hai tướng đối mặt khi Tướng di chuyển đến ({new_row}, {new_col})")
+        trace = self.facing_trace_site
+        if trace.enabled:
+            trace("Kiểm tra hai tướng đối mặt khi Tướng di chuyển đến (%s, %s)", new_row, new_col)
         
         # Kiểm tra cột
         if 3 <= new_col <= 5:
@@ -110,7 +132,8 @@ class General(Piece):
             for row in range(10):
                 piece = board[row][new_col]
                 if isinstance(piece, General) and piece.color != self.color:
-                    print(f"  - Tìm thấy tướng đối phương tại ({row}, {new_col})")
+                    if trace.enabled:
+                        trace("  - Tìm thấy tướng đối phương tại (%s, %s)", row, new_col)
                     
                     # Kiểm tra có quân cờ nào ở giữa hai tướng không
                     min_row = min(new_row, row)
@@ -119,13 +142,15 @@ class General(Piece):
                     has_piece_between = False
                     for r in range(min_row + 1, max_row):
                         if board[r][new_col] != 0:
-                            print(f"    + Có quân cờ {board[r][new_col].get_name()} tại ({r}, {new_col})")
+                            if trace.enabled:
+                                trace("    + Có quân cờ %s tại (%s, %s)", board[r][new_col].get_name(), r, new_col)
                             has_piece_between = True
                             break
                     
                     # Nếu không có quân cờ nào ở giữa, không cho phép nước đi này
                     if not has_piece_between:
-                        print(f"  - Không hợp lệ: Hai tướng đối mặt trực tiếp")
+                        if trace.enabled:
+                            trace("  - Không hợp lệ: Hai tướng đối mặt trực tiếp")
                         return False
                     
                     break
@@ -136,6 +161,9 @@ class General(Piece):
 class Advisor(Piece):
     """Quân Sĩ"""
     
+    # Điểm trace của is_valid_move (xem movetrace.py), mặc định tắt
+    trace_site = movetrace.site("Advisor.is_valid_move")
+    
     def get_name(self):
         """Lấy tên hiển thị của quân cờ"""
         return "仕" if self.color.red() > 0 else "士"
@@ -166,6 +194,9 @@ class Advisor(Piece):
 class Elephant(Piece):
     """Quân Tượng"""
     
+    # Điểm trace của is_valid_move (xem movetrace.py), mặc định tắt
+    trace_site = movetrace.site("Elephant.is_valid_move")
+    
     def get_name(self):
         """Lấy tên hiển thị của quân cờ"""
         return "相" if self.color.red() > 0 else "象"
@@ -203,6 +234,9 @@ class Elephant(Piece):
 class Horse(Piece):
     """Quân Mã"""
     
+    # Điểm trace của is_valid_move (xem movetrace.py), mặc định tắt
+    trace_site = movetrace.site("Horse.is_valid_move")
+    
     def get_name(self):
         """Lấy tên hiển thị của quân cờ"""
         return "傌" if self.color.red() > 0 else "馬"
@@ -215,14 +249,17 @@ class Horse(Piece):
         from_row, from_col = from_pos
         to_row, to_col = to_pos
         
-        print(f"Kiểm tra nước đi của Mã từ ({from_row},{from_col}) đến ({to_row},{to_col})")
+        trace = self.trace_site
+        if trace.enabled:
+            trace("Kiểm tra nước đi của Mã từ (%s,%s) đến (%s,%s)", from_row, from_col, to_row, to_col)
         
         # Mã di chuyển theo kiểu "日" (1 ô theo chiều ngang/dọc + 1 ô theo đường chéo)
         row_diff = abs(to_row - from_row)
         col_diff = abs(to_col - from_col)
         
         if not ((row_diff == 2 and col_diff == 1) or (row_diff == 1 and col_diff == 2)):
-            print(f"  - Không hợp lệ: Mã chỉ có thể di chuyển theo kiểu 'nhảy' (1-2 hoặc 2-1)")
+            if trace.enabled:
+                trace("  - Không hợp lệ: Mã chỉ có thể di chuyển theo kiểu 'nhảy' (1-2 hoặc 2-1)")
             return False
         
         # Kiểm tra xem có bị "bẻ chân" không
@@ -234,16 +271,21 @@ class Horse(Piece):
             block_col = from_col + (1 if to_col > from_col else -1)
         
         if board[block_row][block_col] != 0:
-            print(f"  - Không hợp lệ: Có quân cờ {board[block_row][block_col].get_name()} chặn đường tại ({block_row}, {block_col})")
+            if trace.enabled:
+                trace("  - Không hợp lệ: Có quân cờ %s chặn đường tại (%s, %s)", board[block_row][block_col].get_name(), block_row, block_col)
             return False
         
-        print(f"  - Hợp lệ: Mã di chuyển theo kiểu 'nhảy' và không bị chặn")
+        if trace.enabled:
+            trace("  - Hợp lệ: Mã di chuyển theo kiểu 'nhảy' và không bị chặn")
         return True  # Không có quân cờ chặn đường
 
 
 class Chariot(Piece):
     """Quân Xe"""
     
+    # Điểm trace của is_valid_move (xem movetrace.py), mặc định tắt
+    trace_site = movetrace.site("Chariot.is_valid_move")
+    
     def get_name(self):
         """Lấy tên hiển thị của quân cờ"""
         return "俥" if self.color.red() > 0 else "車"
@@ -256,11 +298,14 @@ class Chariot(Piece):
         from_row, from_col = from_pos
         to_row, to_col = to_pos
         
-        print(f"Kiểm tra nước đi của Xe từ ({from_row},{from_col}) đến ({to_row},{to_col})")
+        trace = self.trace_site
+        if trace.enabled:
+            trace("Kiểm tra nước đi của Xe từ (%s,%s) đến (%s,%s)", from_row, from_col, to_row, to_col)
         
         # Xe chỉ có thể di chuyển theo hàng ngang hoặc dọc
         if from_row != to_row and from_col != to_col:
-            print(f"  - Không hợp lệ: Xe chỉ có thể di chuyển theo hàng ngang hoặc dọc")
+            if trace.enabled:
+                trace("  - Không hợp lệ: Xe chỉ có thể di chuyển theo hàng ngang hoặc dọc")
             return False
         
         # Kiểm tra xem có quân cờ nào chặn đường không
@@ -270,7 +315,8 @@ class Chariot(Piece):
             
             for col in range(start_col, end_col):
                 if board[from_row][col] != 0:
-                    print(f"  - Không hợp lệ: Có quân cờ {board[from_row][col].get_name()} chặn đường tại ({from_row}, {col})")
+                    if trace.enabled:
+                        trace("  - Không hợp lệ: Có quân cờ %s chặn đường tại (%s, %s)", board[from_row][col].get_name(), from_row, col)
                     return False
         else:  # Di chuyển theo hàng dọc
             start_row = min(from_row, to_row) + 1
@@ -278,16 +324,21 @@ class Chariot(Piece):
             
             for row in range(start_row, end_row):
                 if board[row][from_col] != 0:
-                    print(f"  - Không hợp lệ: Có quân cờ {board[row][from_col].get_name()} chặn đường tại ({row}, {from_col})")
+                    if trace.enabled:
+                        trace("  - Không hợp lệ: Có quân cờ %s chặn đường tại (%s, %s)", board[row][from_col].get_name(), row, from_col)
                     return False
         
-        print(f"  - Hợp lệ: Xe di chuyển theo đường thẳng và không bị chặn")
+        if trace.enabled:
+            trace("  - Hợp lệ: Xe di chuyển theo đường thẳng và không bị chặn")
         return True
 
 
 class Cannon(Piece):
     """Quân Pháo"""
     
+    # Điểm trace của is_valid_move (xem movetrace.py), mặc định tắt
+    trace_site = movetrace.site("Cannon.is_valid_move")
+    
     def get_name(self):
         """Lấy tên hiển thị của quân cờ"""
         return "炮" if self.color.red() > 0 else "砲"
@@ -334,6 +385,9 @@ class Cannon(Piece):
 class Soldier(Piece):
     """Quân Tốt/Binh"""
     
+    # Điểm trace của is_valid_move (xem movetrace.py), mặc định tắt
+    trace_site = movetrace.site("Soldier.is_valid_move")
+    
     def get_name(self):
         """Lấy tên hiển thị của quân cờ"""
         return "兵" if self.color.red() > 0 else "卒"
@@ -371,3 +425,10 @@ class Soldier(Piece):
                     return to_row == from_row
                 else:  # Di chuyển xuống dưới
                     return to_row == from_row + 1
+
+
+# Lớp quân cờ theo tên, dùng để dựng lại bàn cờ từ thế cờ của AI
+PIECE_CLASSES = {
+    cls.__name__: cls
+    for cls in (General, Advisor, Elephant, Horse, Chariot, Cannon, Soldier)
+}
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Kiểm tra hồi quy cho engine cơ bản (engine/ai.py): engine phải đi nước chiếu
+hết khi có, không chỉ "thấy" chiếu hết ở cuối cây rồi đi nước khác.
+
+Chạy từ thư mục gốc: python -m pytest -q tests
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from engine import ChineseChessAI, Position, RED, coords_to_move, generate_legal_moves, in_check
+from engine.ai import find_best_move_minimax
+
+# Đỏ chiếu hết trong một nước bằng Xe a1-d1 (Xe a0 giữ hàng cuối)
+MATE_IN_ONE_FEN = '3k5/9/9/9/9/9/9/9/R8/R3K4 w - - 0 1'
+
+
+def is_mate(position):
+    """Bên đến lượt bị chiếu và không còn nước đi hợp lệ"""
+    return in_check(position, position.side) and not generate_legal_moves(position)
+
+
+class MateInOneTest(unittest.TestCase):
+    def test_engine_plays_mate_in_one(self):
+        for level in ('medium', 'hard'):
+            ai = ChineseChessAI()
+            ai.set_difficulty(level)
+            position = Position.from_fen(MATE_IN_ONE_FEN)
+            move = ai.get_best_move(position, RED)
+            position.make_move(coords_to_move(*move))
+            self.assertTrue(is_mate(position), "%s: %s không chiếu hết" % (level, move))
+
+    def test_minimax_plays_mate_in_one(self):
+        position = Position.from_fen(MATE_IN_ONE_FEN)
+        position.make_move(find_best_move_minimax(position, RED, depth=3))
+        self.assertTrue(is_mate(position))
+
+
+if __name__ == '__main__':
+    unittest.main()